@@ -0,0 +1,72 @@
+"""answers question index
+
+Revision ID: 3b7d52c9e1f4
+Revises: eca39fe71b2b
+Create Date: 2026-10-18 13:40:02.915734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d52c9e1f4"
+down_revision: Union[str, Sequence[str], None] = "eca39fe71b2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс под загрузку ответов вопроса, каскадное удаление и выборку
+    # ответов вопроса по (created_at, id). Индексы по id дублируют первичные ключи
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_answers_question_id_created_at_id",
+            "answers",
+            ["question_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_questions_id",
+            table_name="questions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_answers_id",
+            table_name="answers",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_answers_id",
+            "answers",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_questions_id",
+            "questions",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_answers_question_id_created_at_id",
+            table_name="answers",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
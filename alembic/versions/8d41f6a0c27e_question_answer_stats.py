@@ -0,0 +1,153 @@
+"""question answer stats
+
+Revision ID: 8d41f6a0c27e
+Revises: 3b7d52c9e1f4
+Create Date: 2026-10-18 14:21:48.603117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41f6a0c27e"
+down_revision: Union[str, Sequence[str], None] = "3b7d52c9e1f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Триггеры уровня оператора с таблицами переходов: массовая вставка или
+# удаление ответов обновляет каждый затронутый вопрос одним UPDATE.
+# Строки вопросов блокируются заранее в порядке id: порядок строк в UPDATE
+# зависит от плана, и транзакции с пересекающимися наборами вопросов иначе
+# могут заблокировать друг друга. FOR NO KEY UPDATE не конфликтует с
+# FOR KEY SHARE, которую берут проверки внешнего ключа при вставке ответов.
+AFTER_INSERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION answers_after_insert_stats() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM questions
+    WHERE id IN (SELECT question_id FROM new_answers)
+    ORDER BY id
+    FOR NO KEY UPDATE;
+    UPDATE questions AS q
+    SET answer_count = q.answer_count + n.answer_count,
+        last_answer_at = GREATEST(q.last_answer_at, n.last_answer_at)
+    FROM (
+        SELECT question_id, count(*) AS answer_count, max(created_at) AS last_answer_at
+        FROM new_answers
+        GROUP BY question_id
+    ) AS n
+    WHERE q.id = n.question_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+AFTER_DELETE_FUNCTION = """
+CREATE OR REPLACE FUNCTION answers_after_delete_stats() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM questions
+    WHERE id IN (SELECT question_id FROM old_answers)
+    ORDER BY id
+    FOR NO KEY UPDATE;
+    UPDATE questions AS q
+    SET answer_count = q.answer_count - o.answer_count,
+        last_answer_at = (
+            SELECT max(a.created_at) FROM answers AS a WHERE a.question_id = q.id
+        )
+    FROM (
+        SELECT question_id, count(*) AS answer_count
+        FROM old_answers
+        GROUP BY question_id
+    ) AS o
+    WHERE q.id = o.question_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL = """
+UPDATE questions AS q
+SET answer_count = s.answer_count, last_answer_at = s.last_answer_at
+FROM (
+    SELECT question_id, count(*) AS answer_count, max(created_at) AS last_answer_at
+    FROM answers
+    GROUP BY question_id
+) AS s
+WHERE q.id = s.question_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "questions",
+        sa.Column("answer_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "questions",
+        sa.Column("last_answer_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.execute(AFTER_INSERT_FUNCTION)
+    op.execute(AFTER_DELETE_FUNCTION)
+    # CREATE TRIGGER блокирует запись в answers до конца транзакции,
+    # поэтому заполнение ниже не пропустит ответы, добавленные параллельно
+    op.execute(
+        "CREATE TRIGGER answers_after_insert_stats AFTER INSERT ON answers "
+        "REFERENCING NEW TABLE AS new_answers "
+        "FOR EACH STATEMENT EXECUTE FUNCTION answers_after_insert_stats()"
+    )
+    op.execute(
+        "CREATE TRIGGER answers_after_delete_stats AFTER DELETE ON answers "
+        "REFERENCING OLD TABLE AS old_answers "
+        "FOR EACH STATEMENT EXECUTE FUNCTION answers_after_delete_stats()"
+    )
+    op.execute(BACKFILL)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_answer_count_id",
+            "questions",
+            ["answer_count", "id"],
+            unique=False,
+            postgresql_include=["text", "created_at", "last_answer_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_questions_last_answer_at_id",
+            "questions",
+            ["last_answer_at", "id"],
+            unique=False,
+            postgresql_include=["text", "created_at", "answer_count"],
+            postgresql_where=sa.text("last_answer_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_questions_last_answer_at_id",
+            table_name="questions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_questions_answer_count_id",
+            table_name="questions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.execute("DROP TRIGGER IF EXISTS answers_after_delete_stats ON answers")
+    op.execute("DROP TRIGGER IF EXISTS answers_after_insert_stats ON answers")
+    op.execute("DROP FUNCTION IF EXISTS answers_after_delete_stats()")
+    op.execute("DROP FUNCTION IF EXISTS answers_after_insert_stats()")
+    op.drop_column("questions", "last_answer_at")
+    op.drop_column("questions", "answer_count")
@@ -0,0 +1,43 @@
+"""answers user index
+
+Revision ID: c5e0a8134d96
+Revises: 8d41f6a0c27e
+Create Date: 2026-10-18 15:02:36.180442
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e0a8134d96"
+down_revision: Union[str, Sequence[str], None] = "8d41f6a0c27e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс под постраничный список ответов пользователя
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_answers_user_id_created_at_id",
+            "answers",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_answers_user_id_created_at_id",
+            table_name="answers",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
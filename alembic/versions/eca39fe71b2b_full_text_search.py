@@ -0,0 +1,98 @@
+"""full text search
+
+Revision ID: eca39fe71b2b
+Revises: f024b0a0a69b
+Create Date: 2026-10-18 13:05:17.482913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "eca39fe71b2b"
+down_revision: Union[str, Sequence[str], None] = "f024b0a0a69b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_TABLES = ("questions", "answers")
+
+BACKFILL_BATCH_SIZE = 10000
+
+# Колонка поддерживается триггером, а не объявлена вычисляемой: добавление
+# вычисляемой колонки перезаписывает таблицу под ACCESS EXCLUSIVE блокировкой,
+# а обычная nullable колонка добавляется без перезаписи
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('russian', NEW.text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def backfill_search_vector(table: str) -> None:
+    """Заполнить колонку для существующих строк по диапазонам id.
+
+    Каждый диапазон обновляется в своей транзакции, поэтому строки не
+    блокируются надолго. Новые и измененные строки уже заполняет триггер.
+    """
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            sa.text(
+                f"UPDATE {table} SET search_vector = to_tsvector('russian', text) "
+                "WHERE id BETWEEN :first AND :last AND search_vector IS NULL"
+            ),
+            {"first": start + 1, "last": start + BACKFILL_BATCH_SIZE},
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    for table in SEARCH_TABLES:
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF text "
+            f"ON {table} FOR EACH ROW EXECUTE FUNCTION search_vector_update()"
+        )
+
+    # Колонки и триггеры фиксируются до заполнения, далее каждый оператор
+    # выполняется в своей транзакции
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            backfill_search_vector(table)
+        for table in SEARCH_TABLES:
+            op.create_index(
+                f"ix_{table}_search_vector",
+                table,
+                ["search_vector"],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in SEARCH_TABLES:
+            op.drop_index(
+                f"ix_{table}_search_vector",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for table in SEARCH_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+        op.drop_column(table, "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS search_vector_update()")
@@ -0,0 +1,43 @@
+"""questions keyset index
+
+Revision ID: f024b0a0a69b
+Revises: a99ce46b82cf
+Create Date: 2026-10-18 10:12:41.306518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f024b0a0a69b"
+down_revision: Union[str, Sequence[str], None] = "a99ce46b82cf"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс под постраничную выборку по (created_at, id) без OFFSET
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_created_at_id",
+            "questions",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_questions_created_at_id",
+            table_name="questions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
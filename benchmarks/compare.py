@@ -0,0 +1,66 @@
+"""Сравнение двух результатов нагрузочного теста.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+
+Код возврата 1, если p95 или пропускная способность какого-либо маршрута
+ухудшились больше чем на --threshold процентов.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def is_regression(metric: str, percent: float, threshold: float) -> bool:
+    if metric == "rps":
+        return percent < -threshold
+    return metric == "p95_ms" and percent > threshold
+
+
+def compare(before: dict, after: dict, threshold: float) -> List[str]:
+    regressions = []
+    rows = [("total", before["total"], after["total"])] + [
+        (route, before["routes"][route], stats)
+        for route, stats in after["routes"].items()
+        if route in before["routes"]
+    ]
+    print(f"{'route':<48}" + "".join(f"{metric:>22}" for metric in METRICS))
+    for route, old, new in rows:
+        cells = []
+        for metric in METRICS:
+            percent = change(old[metric], new[metric])
+            mark = "!" if is_regression(metric, percent, threshold) else " "
+            if mark == "!":
+                regressions.append(f"{route} {metric} {percent:+.1f}%")
+            cells.append(f"{old[metric]:>9} -> {new[metric]:<9}{mark}")
+        print(f"{route:<48}" + "".join(f"{cell:>22}" for cell in cells))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Сравнение результатов нагрузочного теста")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Допуск, %%")
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+
+    regressions = compare(before, after, args.threshold)
+    if regressions:
+        print("\nУхудшения:\n" + "\n".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Нагрузочный тест всех эндпоинтов вопросов и ответов.
+
+Запуск с собственным сервером (uvicorn src.main:app) на БД из окружения:
+
+    python -m benchmarks.load_test --start-server --concurrency 32 --duration 30 \\
+        --write-ratio 0.2 --output results.json
+
+Тест создает и удаляет данные, поэтому его нужно запускать на отдельной БД.
+Результаты двух прогонов сравниваются через benchmarks.compare.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.stats import summarize
+
+OK_STATUSES = frozenset({200, 201, 204, 304, 404})
+
+SEARCH_QUERIES = ("вопрос", "нагрузочный ответ", '"ответ 1"', "вопрос -нагрузочный")
+
+
+@dataclass
+class State:
+    """Известные тесту id, которые используются в запросах и пополняются при создании"""
+
+    rng: random.Random
+    question_ids: List[int] = field(default_factory=list)
+    answer_ids: List[int] = field(default_factory=list)
+
+    def question_id(self) -> int:
+        return self.rng.choice(self.question_ids) if self.question_ids else 1
+
+    def answer_id(self) -> int:
+        return self.rng.choice(self.answer_ids) if self.answer_ids else 1
+
+    def take(self, ids: List[int], count: int) -> List[int]:
+        """Забрать id для удаления, чтобы другие запросы реже получали 404"""
+        taken = []
+        for _ in range(min(count, len(ids))):
+            taken.append(ids.pop(self.rng.randrange(len(ids))))
+        return taken
+
+    def user_id(self) -> str:
+        return f"bench-user-{self.rng.randrange(100)}"
+
+
+Call = Callable[[httpx.AsyncClient, State], Awaitable[httpx.Response]]
+
+
+@dataclass
+class Operation:
+    route: str
+    write: bool
+    weight: int
+    call: Call
+
+
+async def list_questions(client, state):
+    return await client.get("/questions/", params={"limit": 20})
+
+
+async def list_questions_summary(client, state):
+    return await client.get("/questions/summary", params={"limit": 50})
+
+
+async def export_questions(client, state):
+    async with client.stream("GET", "/questions/export") as response:
+        async for _ in response.aiter_bytes():
+            pass
+    return response
+
+
+async def search_questions(client, state):
+    params = {"q": state.rng.choice(SEARCH_QUERIES), "answers": state.rng.random() < 0.5}
+    return await client.get("/questions/search", params={**params, "limit": 20})
+
+
+async def get_question(client, state):
+    return await client.get(f"/questions/{state.question_id()}")
+
+
+async def get_questions_bulk(client, state):
+    ids = [state.question_id() for _ in range(20)]
+    return await client.get("/questions/bulk", params={"ids": ids})
+
+
+async def get_answer(client, state):
+    return await client.get(f"/answers/{state.answer_id()}")
+
+
+async def get_answers_bulk(client, state):
+    ids = [state.answer_id() for _ in range(20)]
+    return await client.get("/answers/bulk", params={"ids": ids})
+
+
+async def list_user_answers(client, state):
+    params = {"limit": 20, "with_question": state.rng.random() < 0.5}
+    return await client.get(f"/answers/user/{state.user_id()}", params=params)
+
+
+async def create_question(client, state):
+    response = await client.post("/questions/", json={"text": "Нагрузочный вопрос"})
+    if response.status_code == 201:
+        state.question_ids.append(response.json()["id"])
+    return response
+
+
+async def create_questions_bulk(client, state):
+    payload = [{"text": f"Нагрузочный вопрос {i}"} for i in range(10)]
+    response = await client.post("/questions/bulk", json=payload)
+    if response.status_code == 201:
+        state.question_ids.extend(q["id"] for q in response.json()["created"])
+    return response
+
+
+async def create_answer(client, state):
+    response = await client.post(
+        f"/answers/question/{state.question_id()}",
+        json={"user_id": state.user_id(), "text": "Нагрузочный ответ"},
+    )
+    if response.status_code == 201:
+        state.answer_ids.append(response.json()["id"])
+    return response
+
+
+async def create_answers_bulk(client, state):
+    payload = [{"user_id": state.user_id(), "text": f"Ответ {i}"} for i in range(10)]
+    response = await client.post(
+        f"/answers/question/{state.question_id()}/bulk", json=payload
+    )
+    if response.status_code == 201:
+        state.answer_ids.extend(a["id"] for a in response.json())
+    return response
+
+
+async def delete_question(client, state):
+    ids = state.take(state.question_ids, 1) or [0]
+    return await client.delete(f"/questions/{ids[0]}")
+
+
+async def delete_questions_bulk(client, state):
+    ids = state.take(state.question_ids, 5) or [0]
+    return await client.delete("/questions/", params={"ids": ids})
+
+
+async def delete_answer(client, state):
+    ids = state.take(state.answer_ids, 1) or [0]
+    return await client.delete(f"/answers/{ids[0]}")
+
+
+async def delete_answers_bulk(client, state):
+    ids = state.take(state.answer_ids, 5) or [0]
+    return await client.delete("/answers/", params={"ids": ids})
+
+
+OPERATIONS = [
+    Operation("GET /questions/", False, 20, list_questions),
+    Operation("GET /questions/summary", False, 10, list_questions_summary),
+    Operation("GET /questions/export", False, 1, export_questions),
+    Operation("GET /questions/search", False, 10, search_questions),
+    Operation("GET /questions/{question_id}", False, 40, get_question),
+    Operation("GET /questions/bulk", False, 5, get_questions_bulk),
+    Operation("GET /answers/{answer_id}", False, 29, get_answer),
+    Operation("GET /answers/bulk", False, 5, get_answers_bulk),
+    Operation("GET /answers/user/{user_id}", False, 10, list_user_answers),
+    Operation("POST /questions/", True, 15, create_question),
+    Operation("POST /questions/bulk", True, 3, create_questions_bulk),
+    Operation("POST /answers/question/{question_id}", True, 50, create_answer),
+    Operation("POST /answers/question/{question_id}/bulk", True, 10, create_answers_bulk),
+    Operation("DELETE /questions/{question_id}", True, 5, delete_question),
+    Operation("DELETE /questions/", True, 2, delete_questions_bulk),
+    Operation("DELETE /answers/{answer_id}", True, 10, delete_answer),
+    Operation("DELETE /answers/", True, 5, delete_answers_bulk),
+]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {op.route: [] for op in OPERATIONS}
+        self.errors: Dict[str, int] = {op.route: 0 for op in OPERATIONS}
+        self.statuses: Dict[str, Dict[str, int]] = {op.route: {} for op in OPERATIONS}
+
+    def record(self, route: str, seconds: float, status: Optional[int]) -> None:
+        self.latencies[route].append(seconds)
+        key = str(status) if status is not None else "error"
+        self.statuses[route][key] = self.statuses[route].get(key, 0) + 1
+        if status not in OK_STATUSES:
+            self.errors[route] += 1
+
+
+def pick_operation(rng: random.Random, write_ratio: float) -> Operation:
+    write = rng.random() < write_ratio
+    candidates = [op for op in OPERATIONS if op.write == write]
+    return rng.choices(candidates, weights=[op.weight for op in candidates])[0]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    state: State,
+    recorder: Optional[Recorder],
+    write_ratio: float,
+    deadline: float,
+) -> None:
+    while time.perf_counter() < deadline:
+        operation = pick_operation(state.rng, write_ratio)
+        start = time.perf_counter()
+        try:
+            status: Optional[int] = (await operation.call(client, state)).status_code
+        except httpx.HTTPError:
+            status = None
+        if recorder is not None:
+            recorder.record(operation.route, time.perf_counter() - start, status)
+
+
+async def seed(client: httpx.AsyncClient, state: State, questions: int, answers: int) -> None:
+    """Создать начальные данные, чтобы чтения попадали в существующие записи"""
+    for start in range(0, questions, 100):
+        payload = [{"text": f"Вопрос {i}"} for i in range(start, min(start + 100, questions))]
+        response = await client.post("/questions/bulk", json=payload)
+        response.raise_for_status()
+        state.question_ids.extend(q["id"] for q in response.json()["created"])
+    for question_id in state.question_ids:
+        if answers <= 0:
+            break
+        payload = [{"user_id": state.user_id(), "text": f"Ответ {i}"} for i in range(answers)]
+        response = await client.post(f"/answers/question/{question_id}/bulk", json=payload)
+        response.raise_for_status()
+        state.answer_ids.extend(a["id"] for a in response.json())
+
+
+async def run(args: argparse.Namespace) -> dict:
+    state = State(rng=random.Random(args.seed))
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        await seed(client, state, args.seed_questions, args.seed_answers)
+
+        if args.warmup > 0:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(
+                *(
+                    worker(client, state, None, args.write_ratio, deadline)
+                    for _ in range(args.concurrency)
+                )
+            )
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                worker(client, state, recorder, args.write_ratio, deadline)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    routes = {
+        route: {
+            **summarize(latencies, elapsed),
+            "errors": recorder.errors[route],
+            "statuses": recorder.statuses[route],
+        }
+        for route, latencies in recorder.latencies.items()
+    }
+    all_latencies = [
+        value for latencies in recorder.latencies.values() for value in latencies
+    ]
+    return {
+        "meta": run_metadata(args),
+        "total": {
+            **summarize(all_latencies, elapsed),
+            "errors": sum(recorder.errors.values()),
+        },
+        "routes": routes,
+    }
+
+
+def run_metadata(args: argparse.Namespace) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "write_ratio": args.write_ratio,
+        "seed": args.seed,
+        "seed_questions": args.seed_questions,
+        "seed_answers": args.seed_answers,
+    }
+
+
+def start_server(host: str, port: int) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "uvicorn", "src.main:app",
+        "--host", host, "--port", str(port), "--log-level", "warning",
+    ]  # fmt: skip
+    return subprocess.Popen(command, env={**os.environ, "RELOAD": "false"})
+
+
+def wait_for_server(url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + "/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Сервер {url} не запустился за {timeout} с")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Нагрузочный тест API вопросов и ответов")
+    parser.add_argument("--url", default="http://127.0.0.1:8001", help="Адрес сервера")
+    parser.add_argument(
+        "--start-server", action="store_true", help="Запустить uvicorn src.main:app на --url"
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="Параллельных клиентов")
+    parser.add_argument("--duration", type=float, default=30.0, help="Длительность замера, с")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Прогрев перед замером, с")
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.2, help="Доля изменяющих запросов (0..1)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Зерно генератора запросов")
+    parser.add_argument("--seed-questions", type=int, default=200)
+    parser.add_argument("--seed-answers", type=int, default=5, help="Ответов на вопрос")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Таймаут запроса, с")
+    parser.add_argument("--output", help="Файл для JSON с результатами (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    server = None
+    if args.start_server:
+        url = httpx.URL(args.url)
+        server = start_server(url.host, url.port or 80)
+    try:
+        wait_for_server(args.url, timeout=30)
+        result = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
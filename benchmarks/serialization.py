@@ -0,0 +1,73 @@
+"""Сравнение сериализации вопроса с большим числом ответов.
+
+    python -m benchmarks.serialization --answers 100 1000 10000
+
+model - путь FastAPI через response_model: проверка QuestionRead с
+from_attributes, преобразование в JSON-совместимые типы и json.dumps;
+fast - словари из снимка и orjson (src.api.serialization).
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from src.api.serialization import FastJSONResponse, question_payload
+from src.schemas.questions_answers import QuestionRead
+from src.services.cache import AnswerSnapshot, QuestionSnapshot
+
+question_adapter = TypeAdapter(QuestionRead)
+
+
+def make_question(answers: int) -> QuestionSnapshot:
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return QuestionSnapshot(
+        id=1,
+        text="Вопрос для замера",
+        created_at=created_at,
+        answers=tuple(
+            AnswerSnapshot(
+                i, 1, f"user-{i % 100}", f"Ответ номер {i}", created_at + timedelta(seconds=i)
+            )
+            for i in range(1, answers + 1)
+        ),
+    )
+
+
+def model_path(question) -> bytes:
+    validated = question_adapter.validate_python(question, from_attributes=True)
+    content = question_adapter.dump_python(validated, mode="json")
+    return JSONResponse(content).body
+
+
+def fast_path(question) -> bytes:
+    return FastJSONResponse(question_payload(question)).body
+
+
+def measure(answers: int, repeat: int) -> dict:
+    question = make_question(answers)
+    assert model_path(question) == fast_path(question), "ответы различаются"
+    number = max(1, 20000 // max(answers, 1))
+    result = {"answers": answers, "bytes": len(fast_path(question))}
+    for name, path in (("model", model_path), ("fast", fast_path)):
+        best = min(timeit.repeat(lambda: path(question), number=number, repeat=repeat))
+        result[f"{name}_ms"] = round(best / number * 1000, 4)
+    result["speedup"] = round(result["model_ms"] / result["fast_ms"], 2)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Замер сериализации ответов API")
+    parser.add_argument("--answers", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    results = [measure(answers, args.repeat) for answers in args.answers]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Замер холодного запуска сервиса.
+
+Для каждого прогона измеряются время импорта src.main в отдельном процессе
+и время от запуска uvicorn src.main:app до первого ответа 200 на --path
+(по умолчанию /ready, который отвечает 200 после открытия соединений с БД):
+
+    python -m benchmarks.startup --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.load_test import start_server
+from benchmarks.stats import percentile
+
+IMPORT_SCRIPT = (
+    "import time; start = time.perf_counter(); import src.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_ok(url: str, path: str, timeout: float) -> float:
+    parsed = httpx.URL(url)
+    start = time.perf_counter()
+    server = start_server(parsed.host, parsed.port or 80)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                if httpx.get(url + path, timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"{url}{path} не ответил 200 за {timeout} с")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def describe(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "min_ms": round(ordered[0] * 1000, 1),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Замер холодного запуска API")
+    parser.add_argument("--url", default="http://127.0.0.1:8002", help="Адрес сервера")
+    parser.add_argument("--path", default="/ready", help="Эндпоинт, ожидающий ответа 200")
+    parser.add_argument("--runs", type=int, default=5, help="Число прогонов")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Таймаут запуска, с")
+    parser.add_argument("--output", help="Файл для JSON с результатами (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    imports, first_ok = [], []
+    for _ in range(args.runs):
+        imports.append(measure_import())
+        first_ok.append(measure_first_ok(args.url, args.path, args.timeout))
+    result = {
+        "meta": {"runs": args.runs, "path": args.path, "python": sys.version.split()[0]},
+        "import": describe(imports),
+        "first_ok": describe(first_ok),
+    }
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
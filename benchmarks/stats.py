@@ -0,0 +1,25 @@
+import math
+from typing import Dict, List, Sequence
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Процентиль методом ближайшего ранга по отсортированной выборке"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Пропускная способность и задержки в миллисекундах"""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
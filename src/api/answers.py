@@ -1,12 +1,28 @@
-from fastapi import APIRouter, HTTPException, status, Response
+from collections import Counter
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, HTTPException, status, Response, Header, Body, Query, Path
 from fastapi.responses import JSONResponse
-from src.core.db_config import db_dependency
-from src.schemas.questions_answers import AnswerRead, AnswerCreate
+from src.api.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
+from src.api.pagination import PageCursor, PageLimit, parse_cursor, set_next_cursor
+from src.api.serialization import answer_payload, fast_response, user_answer_payload
+from src.core.admission import answer_rate_limiter, retry_after_header
+from src.core.config import app_settings
+from src.core.db_config import db_dependency, read_db_dependency
+from src.schemas.questions_answers import (
+    AnswerRead,
+    AnswerCreate,
+    AnswersByIds,
+    BulkDeleteResult,
+    UserAnswerRead,
+)
 from src.services.questions_answers import (
     create_answer,
+    create_answers_bulk,
     get_answer,
+    get_answers_by_ids,
+    get_user_answers,
     delete_answer,
-    get_question_with_answers,
+    delete_answers_bulk,
 )
 from src.core.logging import get_logger
 
@@ -15,6 +31,17 @@ logger = get_logger("questions_answers.api.answers")
 answers_router = APIRouter(prefix="/answers", tags=["Answers"])
 
 
+def check_answer_rate(route: str, answers_per_user: Counter) -> None:
+    retry_after = answer_rate_limiter.acquire(answers_per_user)
+    if retry_after:
+        logger.warning(f"{route} Превышена частота ответов: {list(answers_per_user)}")
+        raise HTTPException(
+            status_code=429,
+            detail="Слишком много ответов, повторите запрос позже",
+            headers=retry_after_header(retry_after),
+        )
+
+
 @answers_router.post(
     "/question/{question_id}",
     response_model=AnswerRead,
@@ -26,14 +53,13 @@ async def post_answer(db: db_dependency, question_id: int, answer: AnswerCreate)
         logger.info(
             f"POST/answers/question/{question_id} Создаем ответ к вопросу с ID {question_id}"
         )
-        question = await get_question_with_answers(db, question_id)
-        if not question:
+        check_answer_rate(f"POST/answers/question/{question_id}", Counter([answer.user_id]))
+        db_answer = await create_answer(db, question_id, answer)
+        if db_answer is None:
             logger.warning(
                 f"POST/answers/question/{question_id} Вопрос с ID {question_id} не найден"
             )
             raise HTTPException(status_code=404, detail="Вопрос не найден")
-
-        db_answer = await create_answer(db, question_id, answer)
         logger.info(
             f"POST/answers/question/{question_id} Успешно создан ответ с ID {db_answer.id}"
         )
@@ -49,16 +75,138 @@ async def post_answer(db: db_dependency, question_id: int, answer: AnswerCreate)
         )
 
 
+@answers_router.post(
+    "/question/{question_id}/bulk",
+    response_model=List[AnswerRead],
+    status_code=status.HTTP_201_CREATED,
+    summary="Добавить несколько ответов к вопросу",
+    description="Проверить существование вопроса один раз и добавить все ответы "
+    "одним запросом к БД",
+)
+async def post_answers_bulk(
+    db: db_dependency,
+    question_id: int,
+    answers: Annotated[List[AnswerCreate], Body(max_length=app_settings.bulk_max_items)],
+):
+    try:
+        logger.info(
+            f"POST/answers/question/{question_id}/bulk Создаем {len(answers)} ответов "
+            f"к вопросу с ID {question_id}"
+        )
+        check_answer_rate(
+            f"POST/answers/question/{question_id}/bulk",
+            Counter(answer.user_id for answer in answers),
+        )
+        created = await create_answers_bulk(db, question_id, answers)
+        if created is None:
+            logger.warning(
+                f"POST/answers/question/{question_id}/bulk "
+                f"Вопрос с ID {question_id} не найден"
+            )
+            raise HTTPException(status_code=404, detail="Вопрос не найден")
+        logger.info(
+            f"POST/answers/question/{question_id}/bulk Успешно создано {len(created)} ответов"
+        )
+        return created
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            f"POST/answers/question/{question_id}/bulk Ошибка: {str(e)}", exc_info=True
+        )
+        await db.rollback()
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"status": 500, "message": str(e), "id": None},
+        )
+
+
+@answers_router.get(
+    "/bulk",
+    response_model=AnswersByIds,
+    summary="Получить несколько ответов по id",
+    description="Ответы в порядке переданных id, загруженные одним запросом. "
+    "Не найденные id перечислены в missing",
+)
+async def get_answers_bulk(
+    db: read_db_dependency,
+    ids: Annotated[List[int], Query(min_length=1, max_length=app_settings.multi_get_max_ids)],
+):
+    try:
+        answer_ids = list(dict.fromkeys(ids))
+        logger.info(f"GET/answers/bulk Получаем {len(answer_ids)} ответов")
+        found = await get_answers_by_ids(db, answer_ids)
+        logger.info(f"GET/answers/bulk Успешно получено {len(found)} ответов")
+        return fast_response(
+            {
+                "items": [answer_payload(found[i]) for i in answer_ids if i in found],
+                "missing": [i for i in answer_ids if i not in found],
+            }
+        )
+    except Exception as e:
+        logger.error(f"GET/answers/bulk Ошибка: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
+@answers_router.get(
+    "/user/{user_id}",
+    response_model=List[UserAnswerRead],
+    summary="Получить ответы пользователя",
+    description="Постраничный список ответов пользователя, новые первыми. "
+    "При with_question=true добавляется текст вопроса. Курсор следующей "
+    "страницы возвращается в заголовке X-Next-Cursor",
+)
+async def list_user_answers(
+    db: read_db_dependency,
+    user_id: Annotated[str, Path(min_length=1, max_length=36)],
+    response: Response,
+    limit: PageLimit = app_settings.page_size_default,
+    after: PageCursor = None,
+    with_question: bool = False,
+):
+    try:
+        logger.info(f"GET/answers/user/{user_id} Получаем ответы пользователя: limit={limit}")
+        position = parse_cursor(f"GET/answers/user/{user_id}", after)
+        answers = await get_user_answers(
+            db, user_id, limit=limit, after=position, include_question=with_question
+        )
+        set_next_cursor(response, answers, limit)
+        logger.info(f"GET/answers/user/{user_id} Успешно получено {len(answers)} ответов")
+        return fast_response(
+            [
+                user_answer_payload(answer, answer.question_text if with_question else None)
+                for answer in answers
+            ],
+            response,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"GET/answers/user/{user_id} Ошибка: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
 @answers_router.get("/{answer_id}", response_model=AnswerRead, summary="Получить ответ по id")
-async def get_answer_by_id(db: db_dependency, answer_id: int):
+async def get_answer_by_id(
+    db: read_db_dependency,
+    answer_id: int,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
     try:
         logger.info(f"GET/answers/{answer_id} Получаем ответ с ID {answer_id}")
         answer = await get_answer(db, answer_id)
         if not answer:
             logger.warning(f"GET/answers/{answer_id} Ответ с ID {answer_id} не найден")
             raise HTTPException(status_code=404, detail="Ответ не найден")
+        # Ответы не изменяются после создания, поэтому ETag зависит только от id
+        etag = make_etag("a", answer_id)
+        if etag_matches(if_none_match, etag):
+            logger.info(f"GET/answers/{answer_id} Ответ не изменился")
+            return not_modified(etag, app_settings.http_cache_max_age_answers)
+        set_cache_headers(response, etag, app_settings.http_cache_max_age_answers)
         logger.info(f"GET/answers/{answer_id} Успешно получен ответ с ID {answer_id}")
-        return answer
+        return fast_response(answer_payload(answer), response)
     except HTTPException:
         raise
     except Exception as e:
@@ -66,6 +214,33 @@ async def get_answer_by_id(db: db_dependency, answer_id: int):
         return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
 
 
+@answers_router.delete(
+    "/",
+    response_model=BulkDeleteResult,
+    summary="Удалить несколько ответов",
+    description="Удалить ответы по списку id одним запросом. В ответе указано, "
+    "какие ответы удалены, а какие не найдены",
+)
+async def delete_answers_by_ids(
+    db: db_dependency,
+    ids: Annotated[List[int], Query(min_length=1, max_length=app_settings.bulk_max_items)],
+):
+    try:
+        answer_ids = list(dict.fromkeys(ids))
+        logger.info(f"DELETE/answers Удаляем {len(answer_ids)} ответов")
+        deleted = set(await delete_answers_bulk(db, answer_ids))
+        result = BulkDeleteResult(
+            deleted=[i for i in answer_ids if i in deleted],
+            not_found=[i for i in answer_ids if i not in deleted],
+        )
+        logger.info(f"DELETE/answers Успешно удалено {len(result.deleted)} ответов")
+        return result
+    except Exception as e:
+        logger.error(f"DELETE/answers Ошибка: {str(e)}", exc_info=True)
+        await db.rollback()
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
 @answers_router.delete("/{answer_id}", summary="Удалить ответ")
 async def delete_answer_by_id(db: db_dependency, answer_id: int):
     try:
@@ -0,0 +1,46 @@
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Response, status
+
+from src.services.cache import answers_version
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def question_etag(question_id: int, answer_count: int, last_answer_id: int) -> str:
+    return make_etag("q", question_id, answer_count, last_answer_id)
+
+
+def page_etag(questions: Iterable, *page_params) -> str:
+    digest = hashlib.sha1(repr(page_params).encode())
+    for question in questions:
+        digest.update(repr((question.id, answers_version(question.answers))).encode())
+    return make_etag("p", digest.hexdigest())
+
+
+def cache_control(max_age: int) -> str:
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Для If-None-Match используется слабое сравнение
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def set_cache_headers(response: Response, etag: str, max_age: int) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control(max_age)
+
+
+def not_modified(etag: str, max_age: int) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, max_age)
+    return response
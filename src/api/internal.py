@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+
+from src.core import db_config
+from src.core.admission import admission_limiters, readiness_problems
+from src.core.logging import get_logger
+from src.core.metrics import CONTENT_TYPE, registry
+from src.services.cache import question_cache
+
+logger = get_logger("questions_answers.api.internal")
+
+internal_router = APIRouter(prefix="/internal", tags=["Internal"])
+
+service_router = APIRouter(tags=["Internal"])
+
+
+@internal_router.get(
+    "/pool",
+    summary="Состояние пула соединений с БД",
+    description="Занятые, свободные и сверхлимитные соединения, а также время "
+    "ожидания соединения из пула. 503, пока пулы не созданы",
+)
+async def get_pool_status():
+    # Движки создаются при запуске приложения и закрываются при остановке
+    if db_config.engine is None:
+        return JSONResponse(
+            status_code=503,
+            content={"status": 503, "message": "Пулы соединений с БД еще не созданы"},
+        )
+    return {
+        "primary": db_config.pool_status(db_config.engine),
+        "replicas": [
+            db_config.pool_status(replica) for replica in db_config.replica_router.engines
+        ],
+    }
+
+
+@internal_router.get("/cache", summary="Статистика кэша вопросов")
+async def get_cache_stats():
+    return question_cache.stats()
+
+
+@internal_router.get(
+    "/admission",
+    summary="Состояние ограничения параллельности",
+    description="Лимиты, запросы в обработке и в очереди, отказы по классам маршрутов",
+)
+async def get_admission_stats():
+    return {name: limiter.stats() for name, limiter in admission_limiters.items()}
+
+
+@service_router.get(
+    "/ready",
+    summary="Готовность принимать запросы",
+    description="503, если пул соединений исчерпан и запросы ждут соединения, недавно были "
+    "таймауты пула или ошибки подключения к БД, либо заполнена очередь допуска запросов",
+)
+async def get_readiness():
+    problems = readiness_problems()
+    if problems:
+        logger.warning(f"Экземпляр не готов принимать запросы: {problems}")
+        return JSONResponse(
+            status_code=503, content={"status": "overloaded", "problems": problems}
+        )
+    return {"status": "ready"}
+
+
+@service_router.get(
+    "/metrics",
+    summary="Метрики в формате Prometheus",
+    description="Число и время обработки HTTP-запросов по маршрутам, время SQL-запросов, "
+    "состояние пула соединений и кэша вопросов",
+)
+async def get_metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,29 @@
+from typing import Annotated, Optional
+
+from fastapi import Header, HTTPException, Query, Response
+
+from src.core.config import app_settings
+from src.core.logging import get_logger
+from src.services.pagination import decode_cursor, encode_cursor
+
+logger = get_logger("questions_answers.api.pagination")
+
+PageLimit = Annotated[
+    int, Query(ge=1, le=app_settings.page_size_max, description="Размер страницы")
+]
+PageCursor = Annotated[Optional[str], Query(description="Курсор из X-Next-Cursor")]
+IfNoneMatch = Annotated[Optional[str], Header()]
+
+
+def parse_cursor(route: str, after: Optional[str], decoder=decode_cursor):
+    try:
+        return decoder(after) if after else None
+    except ValueError:
+        logger.warning(f"{route} Некорректный курсор: {after}")
+        raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+
+def set_next_cursor(response: Response, items: list, limit: int) -> None:
+    if len(items) == limit:
+        last = items[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
@@ -1,33 +1,198 @@
-from fastapi import APIRouter, HTTPException, status, Response
-from fastapi.responses import JSONResponse
+from typing import Annotated, Any, List, Literal, Union
+from fastapi import APIRouter, HTTPException, status, Response, Query, Body
+from fastapi.responses import JSONResponse, StreamingResponse
 from src.services.questions_answers import (
     get_all_questions,
+    get_questions_summary,
+    stream_questions,
+    search_questions,
     create_question,
-    get_question_with_answers,
+    create_questions_bulk,
+    get_question_snapshot,
+    get_questions_by_ids,
+    get_question_version,
     delete_question,
+    delete_questions_bulk,
+    SummarySort,
 )
-from src.schemas.questions_answers import QuestionCreate, QuestionRead
-from src.core.db_config import db_dependency
+from src.services.cache import answers_version
+from src.api.http_cache import (
+    etag_matches,
+    not_modified,
+    page_etag,
+    question_etag,
+    set_cache_headers,
+)
+from src.api.pagination import (
+    IfNoneMatch,
+    PageCursor,
+    PageLimit,
+    parse_cursor,
+    set_next_cursor,
+)
+from src.api.serialization import (
+    dumps,
+    fast_response,
+    question_payload,
+    summary_payload,
+)
+from src.services.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_count_cursor,
+    decode_count_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
+from pydantic import ValidationError
+from src.schemas.questions_answers import (
+    BulkDeleteResult,
+    BulkItemError,
+    QuestionBulkResult,
+    QuestionCreate,
+    QuestionRead,
+    QuestionSearchResult,
+    QuestionSummary,
+    QuestionsByIds,
+)
+from src.core.config import app_settings
+from src.core.db_config import db_dependency, read_db_dependency
 from src.core.logging import get_logger
 
 logger = get_logger("questions_answers.api.questions")
 questions_router = APIRouter(prefix="/questions", tags=["Questions"])
 
 
+# Курсоры краткого списка: позиция в порядке выбранной сортировки
+SUMMARY_CURSORS = {
+    "created": (decode_cursor, lambda q: encode_cursor(q.created_at, q.id)),
+    "answers": (decode_count_cursor, lambda q: encode_count_cursor(q.answer_count, q.id)),
+    "activity": (decode_cursor, lambda q: encode_cursor(q.last_answer_at, q.id)),
+}
+
+
 @questions_router.get(
-    "/", response_model=list[QuestionRead], summary="Получить список всех вопросов"
+    "/",
+    response_model=list[QuestionRead],
+    summary="Получить список вопросов",
+    description="Постраничный список вопросов. Курсор следующей страницы "
+    "возвращается в заголовке X-Next-Cursor",
 )
-async def list_questions(db: db_dependency):
+async def list_questions(
+    db: read_db_dependency,
+    response: Response,
+    limit: PageLimit = app_settings.page_size_default,
+    after: PageCursor = None,
+    if_none_match: IfNoneMatch = None,
+):
     try:
-        logger.info("GET/questions Получаем список всех вопросов")
-        questions = await get_all_questions(db)
+        logger.info(f"GET/questions Получаем страницу вопросов: limit={limit}")
+        position = parse_cursor("GET/questions", after)
+        questions = await get_all_questions(db, limit=limit, after=position)
+        etag = page_etag(questions, limit, after)
+        if etag_matches(if_none_match, etag):
+            logger.info("GET/questions Страница не изменилась")
+            return not_modified(etag, app_settings.http_cache_max_age)
+        set_cache_headers(response, etag, app_settings.http_cache_max_age)
+        set_next_cursor(response, questions, limit)
         logger.info(f"GET/questions Успешно получено {len(questions)} вопросов")
-        return questions
+        return fast_response([question_payload(q) for q in questions], response)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"GET/questions Ошибка: {str(e)}", exc_info=True)
         return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
 
 
+@questions_router.get(
+    "/summary",
+    response_model=list[QuestionSummary],
+    summary="Получить краткий список вопросов",
+    description="Постраничный список вопросов с количеством ответов вместо самих ответов. "
+    "sort=created - по времени создания, answers - по убыванию числа ответов, "
+    "activity - по времени последнего ответа, только вопросы с ответами",
+)
+async def list_questions_summary(
+    db: read_db_dependency,
+    response: Response,
+    limit: PageLimit = app_settings.page_size_default,
+    after: PageCursor = None,
+    sort: SummarySort = "created",
+):
+    try:
+        logger.info(
+            f"GET/questions/summary Получаем краткий список: limit={limit}, sort={sort}"
+        )
+        decoder, encoder = SUMMARY_CURSORS[sort]
+        position = parse_cursor("GET/questions/summary", after, decoder)
+        questions = await get_questions_summary(db, limit=limit, after=position, sort=sort)
+        if len(questions) == limit:
+            response.headers["X-Next-Cursor"] = encoder(questions[-1])
+        logger.info(f"GET/questions/summary Успешно получено {len(questions)} вопросов")
+        return fast_response([summary_payload(q) for q in questions], response)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"GET/questions/summary Ошибка: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
+@questions_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Выгрузить все вопросы",
+    description="Потоковая выгрузка всех вопросов с ответами в формате NDJSON: "
+    "по одному объекту QuestionRead на строку",
+)
+async def export_questions(db: read_db_dependency):
+    logger.info("GET/questions/export Начинаем потоковую выгрузку вопросов")
+
+    async def generate_lines():
+        try:
+            async for question in stream_questions(db):
+                yield dumps(question_payload(question)) + b"\n"
+        except Exception as e:
+            logger.error(f"GET/questions/export Ошибка: {str(e)}", exc_info=True)
+            raise
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+
+@questions_router.get(
+    "/search",
+    response_model=list[QuestionSearchResult],
+    summary="Полнотекстовый поиск вопросов",
+    description="Поиск по тексту вопросов, а при answers=true и по тексту ответов. "
+    'Запрос в синтаксисе веб-поиска: слова, "точные фразы", -исключения, or. '
+    "Результаты упорядочены по релевантности, совпадения выделены тегом <mark>. "
+    "Курсор следующей страницы возвращается в заголовке X-Next-Cursor",
+)
+async def search(
+    db: read_db_dependency,
+    response: Response,
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Поисковый запрос")],
+    answers: Annotated[bool, Query(description="Искать также по ответам")] = False,
+    limit: PageLimit = app_settings.page_size_default,
+    after: PageCursor = None,
+):
+    try:
+        logger.info(f"GET/questions/search Ищем вопросы: q={q[:25]}, answers={answers}")
+        position = parse_cursor("GET/questions/search", after, decode_rank_cursor)
+        results = await search_questions(
+            db, q, include_answers=answers, limit=limit, after=position
+        )
+        if len(results) == limit:
+            last = results[-1]
+            response.headers["X-Next-Cursor"] = encode_rank_cursor(last.rank, last.id)
+        logger.info(f"GET/questions/search Найдено {len(results)} вопросов")
+        return results
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"GET/questions/search Ошибка: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
 @questions_router.post(
     "/",
     response_model=QuestionRead,
@@ -49,21 +214,118 @@ async def new_question(question: QuestionCreate, db: db_dependency):
         )
 
 
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+@questions_router.post(
+    "/bulk",
+    response_model=QuestionBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать несколько вопросов",
+    description="Создать вопросы одним запросом к БД. Элементы списка имеют формат "
+    "QuestionCreate. В режиме atomic любой невалидный элемент отменяет весь запрос, "
+    "в режиме partial создаются только валидные элементы, а по остальным "
+    "возвращаются ошибки с индексами",
+)
+async def new_questions_bulk(
+    db: db_dependency,
+    # Элементы проверяются по одному, чтобы ошибки возвращались с индексами
+    items: Annotated[
+        List[Union[QuestionCreate, Any]], Body(max_length=app_settings.bulk_max_items)
+    ],
+    mode: Literal["atomic", "partial"] = "atomic",
+):
+    try:
+        logger.info(f"POST/questions/bulk Создаем {len(items)} вопросов, режим {mode}")
+        questions, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                questions.append(QuestionCreate.model_validate(item))
+            except ValidationError as e:
+                errors.append(BulkItemError(index=index, message=validation_message(e)))
+
+        if errors and mode == "atomic":
+            logger.warning(f"POST/questions/bulk Невалидных элементов: {len(errors)}")
+            raise HTTPException(
+                status_code=422,
+                detail=[error.model_dump() for error in errors],
+            )
+
+        created = await create_questions_bulk(db, questions)
+        logger.info(f"POST/questions/bulk Успешно создано {len(created)} вопросов")
+        return QuestionBulkResult(created=created, errors=errors)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"POST/questions/bulk Ошибка: {str(e)}", exc_info=True)
+        await db.rollback()
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"status": 500, "message": str(e), "id": None},
+        )
+
+
+@questions_router.get(
+    "/bulk",
+    response_model=QuestionsByIds,
+    summary="Получить несколько вопросов по id",
+    description="Вопросы с ответами в порядке переданных id. Вопросы берутся из кэша, "
+    "остальные загружаются одним запросом. Не найденные id перечислены в missing",
+)
+async def get_questions_bulk(
+    db: read_db_dependency,
+    ids: Annotated[List[int], Query(min_length=1, max_length=app_settings.multi_get_max_ids)],
+):
+    try:
+        question_ids = list(dict.fromkeys(ids))
+        logger.info(f"GET/questions/bulk Получаем {len(question_ids)} вопросов")
+        found = await get_questions_by_ids(db, question_ids)
+        logger.info(f"GET/questions/bulk Успешно получено {len(found)} вопросов")
+        return fast_response(
+            {
+                "items": [question_payload(found[i]) for i in question_ids if i in found],
+                "missing": [i for i in question_ids if i not in found],
+            }
+        )
+    except Exception as e:
+        logger.error(f"GET/questions/bulk Ошибка: {str(e)}", exc_info=True)
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
 @questions_router.get(
     "/{question_id}",
     response_model=QuestionRead,
     summary="Получить вопрос по id",
     description="Получить вопрос по id со всеми ответами на него",
 )
-async def get_question(question_id: int, db: db_dependency):
+async def get_question(
+    question_id: int,
+    db: read_db_dependency,
+    response: Response,
+    if_none_match: IfNoneMatch = None,
+):
     try:
         logger.info(f"GET/questions/{question_id} Получаем вопрос с ID {question_id}")
-        question = await get_question_with_answers(db, question_id)
+        if if_none_match:
+            version = await get_question_version(db, question_id)
+            if version is not None:
+                etag = question_etag(question_id, *version)
+                if etag_matches(if_none_match, etag):
+                    logger.info(f"GET/questions/{question_id} Вопрос не изменился")
+                    return not_modified(etag, app_settings.http_cache_max_age)
+
+        question = await get_question_snapshot(db, question_id)
         if not question:
             logger.warning(f"GET/questions/{question_id} Вопрос с ID {question_id} не найден")
             raise HTTPException(status_code=404, detail="Вопрос не найден")
+        etag = question_etag(question_id, *answers_version(question.answers))
+        set_cache_headers(response, etag, app_settings.http_cache_max_age)
         logger.info(f"GET/questions/{question_id} Успешно получен вопрос с ID {question_id}")
-        return question
+        return fast_response(question_payload(question), response)
     except HTTPException:
         raise
     except Exception as e:
@@ -71,6 +333,33 @@ async def get_question(question_id: int, db: db_dependency):
         return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
 
 
+@questions_router.delete(
+    "/",
+    response_model=BulkDeleteResult,
+    summary="Удалить несколько вопросов по id c ответами",
+    description="Удалить вопросы по списку id одним запросом. В ответе указано, "
+    "какие вопросы удалены, а какие не найдены",
+)
+async def remove_questions_bulk(
+    db: db_dependency,
+    ids: Annotated[List[int], Query(min_length=1, max_length=app_settings.bulk_max_items)],
+):
+    try:
+        question_ids = list(dict.fromkeys(ids))
+        logger.info(f"DELETE/questions Удаляем {len(question_ids)} вопросов")
+        deleted = set(await delete_questions_bulk(db, question_ids))
+        result = BulkDeleteResult(
+            deleted=[i for i in question_ids if i in deleted],
+            not_found=[i for i in question_ids if i not in deleted],
+        )
+        logger.info(f"DELETE/questions Успешно удалено {len(result.deleted)} вопросов")
+        return result
+    except Exception as e:
+        logger.error(f"DELETE/questions Ошибка: {str(e)}", exc_info=True)
+        await db.rollback()
+        return JSONResponse(status_code=500, content={"status": 500, "message": str(e)})
+
+
 @questions_router.delete(
     "/{question_id}",
     status_code=status.HTTP_204_NO_CONTENT,
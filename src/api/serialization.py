@@ -0,0 +1,81 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+
+    def dumps(content: Any) -> bytes:
+        # OPT_UTC_Z: время в UTC выводится как "Z", так же как в Pydantic
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+except ImportError:  # pragma: no cover
+    import json
+    from datetime import datetime
+
+    def _default(value):
+        if isinstance(value, datetime):
+            return value.isoformat().replace("+00:00", "Z")
+        raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+    def dumps(content: Any) -> bytes:
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ, который собирается из словарей без промежуточных моделей Pydantic.
+
+    Байты совпадают с ответом FastAPI через response_model: компактный JSON
+    в UTF-8, поля в порядке схемы, даты в ISO 8601.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def answer_payload(answer) -> dict:
+    """Поля AnswerRead из ORM-объекта, снимка кэша или строки результата"""
+    return {
+        "id": answer.id,
+        "question_id": answer.question_id,
+        "user_id": answer.user_id,
+        "text": answer.text,
+        "created_at": answer.created_at,
+    }
+
+
+def user_answer_payload(answer, question_text: Optional[str] = None) -> dict:
+    """Поля UserAnswerRead"""
+    return {**answer_payload(answer), "question_text": question_text}
+
+
+def question_payload(question) -> dict:
+    """Поля QuestionRead вместе с ответами"""
+    return {
+        "id": question.id,
+        "text": question.text,
+        "created_at": question.created_at,
+        "answers": [answer_payload(answer) for answer in question.answers],
+    }
+
+
+def summary_payload(question) -> dict:
+    """Поля QuestionSummary"""
+    return {
+        "id": question.id,
+        "text": question.text,
+        "created_at": question.created_at,
+        "answer_count": question.answer_count,
+        "last_answer_at": question.last_answer_at,
+    }
+
+
+def fast_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """Ответ с заголовками, выставленными обработчиком в параметре response"""
+    fast = FastJSONResponse(content)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
@@ -0,0 +1,269 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from src.core import db_config
+from src.core.config import app_settings
+from src.core import metrics
+from src.core.middleware import SAFE_METHODS
+
+# Служебные эндпоинты не ограничиваются: проверки готовности и метрики
+# должны отвечать и тогда, когда основные маршруты перегружены
+EXEMPT_PATHS = ("/ready", "/metrics", "/internal/", "/api/openapi", "/openapi.json")
+HEAVY_PATHS = ("/questions/export", "/questions/search")
+
+OVERLOADED_MESSAGE = "Сервис перегружен, повторите запрос позже"
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Класс маршрута для ограничения параллельности, None - без ограничения"""
+    if path == "/" or path.startswith(EXEMPT_PATHS):
+        return None
+    if path.startswith(HEAVY_PATHS):
+        return "heavy"
+    return "read" if method in SAFE_METHODS else "write"
+
+
+class ConcurrencyLimiter:
+    """Ограничение числа одновременно обрабатываемых запросов с очередью.
+
+    Запрос сверх limit ждет в очереди не дольше queue_timeout секунд,
+    а при заполненной очереди сразу получает отказ. Освободившееся место
+    передается первому в очереди, поэтому новые запросы не обгоняют ждущих.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque["asyncio.Future[bool]"] = deque()
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def queue_full(self) -> bool:
+        return self.queued >= self.queue_size
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if self.queue_full():
+            self.rejected_queue_full += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        timer = loop.call_later(self.queue_timeout, _expire, waiter)
+        try:
+            admitted = await waiter
+        except asyncio.CancelledError:
+            # Место могло быть передано одновременно с отменой запроса
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release()
+            raise
+        finally:
+            timer.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        if admitted:
+            self.admitted += 1
+        else:
+            self.rejected_timeout += 1
+        return admitted
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+def _expire(waiter: "asyncio.Future[bool]") -> None:
+    if not waiter.done():
+        waiter.set_result(False)
+
+
+class AdmissionMiddleware:
+    """Ограничивает параллельность по классам маршрутов.
+
+    Перегруженный класс сразу отвечает 503 с заголовком Retry-After, вместо
+    того чтобы копить запросы в ожидании соединения из пула до таймаута клиента.
+    """
+
+    def __init__(self, app, limiters: Dict[str, ConcurrencyLimiter], retry_after: int):
+        self.app = app
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        limiter, name = None, None
+        if scope["type"] == "http":
+            name = route_class(scope["method"], scope["path"])
+            limiter = self.limiters.get(name)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            scope[metrics.SHED_SCOPE_KEY] = name
+            response = JSONResponse(
+                status_code=503,
+                content={"status": 503, "message": OVERLOADED_MESSAGE},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+class TokenBucketLimiter:
+    """Ограничение частоты по ключу: rate токенов в секунду, не больше burst.
+
+    Хранится не больше max_keys последних ключей. Вытесненный ключ
+    при следующем обращении получает полный запас токенов.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+    def retry_after(self, key: Hashable, cost: int = 1) -> float:
+        """Через сколько секунд хватит токенов, 0 - уже хватает"""
+        if not self.enabled:
+            return 0.0
+        missing = min(cost, self.burst) - self._tokens(key, time.monotonic())
+        return max(missing, 0.0) / self.rate
+
+    def consume(self, key: Hashable, cost: int = 1) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self._buckets[key] = (self._tokens(key, now) - min(cost, self.burst), now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def acquire(self, costs: Dict[Hashable, int]) -> float:
+        """Списать токены сразу для всех ключей или ни для одного.
+
+        Возвращает 0, если токены списаны, иначе время до повторной попытки.
+        """
+        wait = max((self.retry_after(key, cost) for key, cost in costs.items()), default=0)
+        if wait > 0:
+            self.limited += 1
+            return wait
+        for key, cost in costs.items():
+            self.consume(key, cost)
+        return 0.0
+
+
+def retry_after_header(seconds: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(math.ceil(seconds), 1))}
+
+
+admission_limiters: Dict[str, ConcurrencyLimiter] = {
+    name: ConcurrencyLimiter(
+        limit,
+        queue_size=app_settings.admission_queue_size,
+        queue_timeout=app_settings.admission_queue_timeout,
+    )
+    for name, limit in (
+        ("read", app_settings.admission_read_limit),
+        ("write", app_settings.admission_write_limit),
+        ("heavy", app_settings.admission_heavy_limit),
+    )
+    if limit > 0
+}
+
+answer_rate_limiter = TokenBucketLimiter(
+    rate=app_settings.answer_rate_limit / 60, burst=app_settings.answer_rate_burst
+)
+
+
+def readiness_problems() -> List[str]:
+    """Причины, по которым экземпляру не стоит направлять новые запросы"""
+    if db_config.engine is None:
+        return ["starting"]
+    problems = []
+    pool = db_config.engine.pool
+    window = app_settings.ready_error_window_seconds
+    capacity = app_settings.db_pool_size + app_settings.db_max_overflow
+    if (
+        app_settings.db_max_overflow >= 0
+        and pool.checkedout() >= capacity
+        and pool.metrics.waiting > app_settings.ready_max_pool_waiters
+    ):
+        problems.append("pool_saturated")
+    if pool.metrics.timed_out_recently(window):
+        problems.append("pool_timeouts")
+    if pool.metrics.failed_recently(window):
+        problems.append("database_unavailable")
+    for name, limiter in admission_limiters.items():
+        if limiter.queue_full():
+            problems.append(f"{name}_queue_full")
+    return problems
+
+
+def collect_admission_metrics() -> Iterable[metrics.Metric]:
+    active = metrics.Gauge(
+        "admission_active_requests", "Запросы в обработке по классам маршрутов", ("class",)
+    )
+    queued = metrics.Gauge(
+        "admission_queued_requests", "Запросы в очереди по классам маршрутов", ("class",)
+    )
+    rejected = metrics.Counter(
+        "admission_rejected_total",
+        "Запросы, отклоненные с 503: очередь заполнена или истекло ожидание",
+        ("class", "reason"),
+    )
+    limited = metrics.Counter(
+        "answer_rate_limited_total", "Ответы, отклоненные с 429 ограничением частоты"
+    )
+    for name, limiter in admission_limiters.items():
+        active.set(limiter.active, (name,))
+        queued.set(limiter.queued, (name,))
+        rejected.inc((name, "queue_full"), limiter.rejected_queue_full)
+        rejected.inc((name, "timeout"), limiter.rejected_timeout)
+    limited.inc((), answer_rate_limiter.limited)
+    return active, queued, rejected, limited
+
+
+metrics.registry.add_collector(collect_admission_metrics)
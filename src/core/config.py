@@ -1,10 +1,11 @@
+import math
 import os
 from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import Field, ConfigDict
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-load_dotenv()
 env_path = Path(".env.docker" if os.getenv("DOCKER_MODE") == "1" else ".env")
 load_dotenv(env_path)
 
@@ -22,6 +23,19 @@ class AppSettings(BaseSettings):
         default="QuestionAnswer", json_schema_extra={"env": "POSTGRES_DB"}
     )
 
+    postgres_replica_dsns: List[str] = Field(
+        default_factory=list, json_schema_extra={"env": "POSTGRES_REPLICA_DSNS"}
+    )
+    replica_retry_seconds: float = Field(
+        default=30.0, json_schema_extra={"env": "REPLICA_RETRY_SECONDS"}
+    )
+    replica_max_lag_seconds: float = Field(
+        default=5.0, json_schema_extra={"env": "REPLICA_MAX_LAG_SECONDS"}
+    )
+    read_your_writes_seconds: float = Field(
+        default=0.0, json_schema_extra={"env": "READ_YOUR_WRITES_SECONDS"}
+    )
+
     @property
     def postgres_dsn(self) -> str:
         return (
@@ -29,16 +43,217 @@ class AppSettings(BaseSettings):
             f"{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    db_pool_size: int = Field(default=5, json_schema_extra={"env": "DB_POOL_SIZE"})
+    db_max_overflow: int = Field(default=10, json_schema_extra={"env": "DB_MAX_OVERFLOW"})
+    db_pool_timeout: float = Field(default=30.0, json_schema_extra={"env": "DB_POOL_TIMEOUT"})
+    db_pool_recycle: int = Field(default=-1, json_schema_extra={"env": "DB_POOL_RECYCLE"})
+    db_pool_pre_ping: bool = Field(
+        default=False, json_schema_extra={"env": "DB_POOL_PRE_PING"}
+    )
+    db_statement_cache_size: int = Field(
+        default=100, json_schema_extra={"env": "DB_STATEMENT_CACHE_SIZE"}
+    )
+    db_max_connections: int = Field(
+        default=90, json_schema_extra={"env": "DB_MAX_CONNECTIONS"}
+    )
+    db_pool_prewarm: int = Field(default=2, json_schema_extra={"env": "DB_POOL_PREWARM"})
+    db_pool_prewarm_timeout: float = Field(
+        default=5.0, json_schema_extra={"env": "DB_POOL_PREWARM_TIMEOUT"}
+    )
+
+    log_queue_size: int = Field(default=10000, json_schema_extra={"env": "LOG_QUEUE_SIZE"})
+    log_overflow_policy: Literal["block", "drop", "count"] = Field(
+        default="count", json_schema_extra={"env": "LOG_OVERFLOW_POLICY"}
+    )
+
     host: str = Field(default="localhost", json_schema_extra={"env": "HOST"})
     port: int = Field(default=8000, json_schema_extra={"env": "PORT"})
     reload: bool = Field(default=True, json_schema_extra={"env": "RELOAD"})
+    server_mode: Literal["development", "production"] = Field(
+        default="development", json_schema_extra={"env": "SERVER_MODE"}
+    )
+    workers: int = Field(default=0, json_schema_extra={"env": "WORKERS"})
+    server_loop: Literal["auto", "asyncio", "uvloop"] = Field(
+        default="auto", json_schema_extra={"env": "SERVER_LOOP"}
+    )
+    server_http: Literal["auto", "h11", "httptools"] = Field(
+        default="auto", json_schema_extra={"env": "SERVER_HTTP"}
+    )
+    server_backlog: int = Field(default=2048, json_schema_extra={"env": "SERVER_BACKLOG"})
+    server_keep_alive: int = Field(default=5, json_schema_extra={"env": "SERVER_KEEP_ALIVE"})
+    server_limit_max_requests: int = Field(
+        default=0, json_schema_extra={"env": "SERVER_LIMIT_MAX_REQUESTS"}
+    )
+    server_graceful_timeout: int = Field(
+        default=30, json_schema_extra={"env": "SERVER_GRACEFUL_TIMEOUT"}
+    )
+
+    page_size_default: int = Field(default=50, json_schema_extra={"env": "PAGE_SIZE_DEFAULT"})
+    page_size_max: int = Field(default=200, json_schema_extra={"env": "PAGE_SIZE_MAX"})
+    bulk_max_items: int = Field(default=1000, json_schema_extra={"env": "BULK_MAX_ITEMS"})
+    multi_get_max_ids: int = Field(
+        default=100, json_schema_extra={"env": "MULTI_GET_MAX_IDS"}
+    )
+    export_batch_size: int = Field(
+        default=500, json_schema_extra={"env": "EXPORT_BATCH_SIZE"}
+    )
+
+    http_cache_max_age: int = Field(
+        default=0, json_schema_extra={"env": "HTTP_CACHE_MAX_AGE"}
+    )
+    http_cache_max_age_answers: int = Field(
+        default=0, json_schema_extra={"env": "HTTP_CACHE_MAX_AGE_ANSWERS"}
+    )
+
+    question_cache_size: int = Field(
+        default=1024, json_schema_extra={"env": "QUESTION_CACHE_SIZE"}
+    )
+    question_cache_ttl: float = Field(
+        default=30.0, json_schema_extra={"env": "QUESTION_CACHE_TTL"}
+    )
+    question_cache_warm_size: int = Field(
+        default=100, json_schema_extra={"env": "QUESTION_CACHE_WARM_SIZE"}
+    )
+    question_cache_hot_file: Path = Field(
+        default=Path("logs/hot_questions.json"),
+        json_schema_extra={"env": "QUESTION_CACHE_HOT_FILE"},
+    )
+    question_cache_multi_worker: bool = Field(
+        default=False, json_schema_extra={"env": "QUESTION_CACHE_MULTI_WORKER"}
+    )
+    question_single_flight: bool = Field(
+        default=True, json_schema_extra={"env": "QUESTION_SINGLE_FLIGHT"}
+    )
+
+    answer_batch_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "ANSWER_BATCH_ENABLED"}
+    )
+    answer_batch_window_ms: float = Field(
+        default=2.0, json_schema_extra={"env": "ANSWER_BATCH_WINDOW_MS"}
+    )
+    answer_batch_max_rows: int = Field(
+        default=100, json_schema_extra={"env": "ANSWER_BATCH_MAX_ROWS"}
+    )
+
+    admission_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "ADMISSION_ENABLED"}
+    )
+    admission_read_limit: int = Field(
+        default=30, json_schema_extra={"env": "ADMISSION_READ_LIMIT"}
+    )
+    admission_write_limit: int = Field(
+        default=15, json_schema_extra={"env": "ADMISSION_WRITE_LIMIT"}
+    )
+    admission_heavy_limit: int = Field(
+        default=3, json_schema_extra={"env": "ADMISSION_HEAVY_LIMIT"}
+    )
+    admission_queue_size: int = Field(
+        default=50, json_schema_extra={"env": "ADMISSION_QUEUE_SIZE"}
+    )
+    admission_queue_timeout: float = Field(
+        default=2.0, json_schema_extra={"env": "ADMISSION_QUEUE_TIMEOUT"}
+    )
+    admission_retry_after: int = Field(
+        default=1, json_schema_extra={"env": "ADMISSION_RETRY_AFTER"}
+    )
+    answer_rate_limit: float = Field(
+        default=0.0, json_schema_extra={"env": "ANSWER_RATE_LIMIT"}
+    )
+    answer_rate_burst: int = Field(default=10, json_schema_extra={"env": "ANSWER_RATE_BURST"})
+    ready_max_pool_waiters: int = Field(
+        default=0, json_schema_extra={"env": "READY_MAX_POOL_WAITERS"}
+    )
+    ready_error_window_seconds: float = Field(
+        default=10.0, json_schema_extra={"env": "READY_ERROR_WINDOW_SECONDS"}
+    )
 
 
 app_settings = AppSettings()
 
 
-uvicorn_options = {
-    "host": app_settings.host,
-    "port": app_settings.port,
-    "reload": app_settings.reload,
-}
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def cpu_count() -> int:
+    # Учитывает ограничение процесса набором ядер (taskset, cpuset)
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    return max(1, min(count, quota)) if quota else count
+
+
+def cgroup_cpu_quota() -> Optional[int]:
+    """Квота процессора контейнера (docker --cpus) в ядрах, None - без квоты"""
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        return math.ceil(int(quota) / int(period))
+    except (OSError, ValueError):
+        # Нет cgroup v2 или квота не задана ("max")
+        return None
+
+
+def connections_per_worker(settings: AppSettings) -> int:
+    # При DB_MAX_OVERFLOW=-1 число сверхлимитных соединений не ограничено
+    return settings.db_pool_size + max(settings.db_max_overflow, 0)
+
+
+def worker_count(settings: AppSettings) -> int:
+    """Число воркеров: WORKERS или по числу ядер.
+
+    Автоматически выбранное число ограничено так, чтобы пулы всех воркеров
+    помещались в DB_MAX_CONNECTIONS соединений с основной БД.
+    """
+    if settings.server_mode == "development":
+        return 1
+    if settings.workers:
+        return settings.workers
+    budget = settings.db_max_connections // max(connections_per_worker(settings), 1)
+    return max(1, min(cpu_count(), budget))
+
+
+def max_primary_connections(settings: AppSettings) -> int:
+    return worker_count(settings) * connections_per_worker(settings)
+
+
+def question_cache_size(settings: AppSettings) -> int:
+    """Размер кэша вопросов, 0 - кэш выключен.
+
+    Кэш свой у каждого процесса, и изменение, сделанное через один воркер, не
+    сбрасывает записи других. Поэтому при нескольких воркерах кэш выключен,
+    если его не включили явно через QUESTION_CACHE_MULTI_WORKER.
+    """
+    if worker_count(settings) > 1 and not settings.question_cache_multi_worker:
+        return 0
+    return settings.question_cache_size
+
+
+def server_options(settings: AppSettings) -> Dict[str, Any]:
+    """Параметры uvicorn.run для режима запуска.
+
+    development - один процесс с перезагрузкой при изменении кода.
+    production - несколько воркеров (см. worker_count) без перезагрузки,
+    каждый воркер - отдельный процесс со своим пулом соединений с БД.
+    """
+    options = {"host": settings.host, "port": settings.port}
+    if settings.server_mode == "development":
+        return {**options, "reload": settings.reload}
+    workers = worker_count(settings)
+    # Перезапуск воркера выполняет только супервизор нескольких процессов,
+    # единственный процесс после limit_max_requests просто завершился бы
+    limit_max_requests = settings.server_limit_max_requests if workers > 1 else 0
+    return {
+        **options,
+        "reload": False,
+        "workers": workers,
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive,
+        "limit_max_requests": limit_max_requests or None,
+        "timeout_graceful_shutdown": settings.server_graceful_timeout,
+    }
+
+
+uvicorn_options = server_options(app_settings)
@@ -1,5 +1,10 @@
-from typing import Union, Callable, Annotated
-from fastapi import Depends
+import asyncio
+import itertools
+import time
+from typing import Union, Callable, Annotated, Iterable, List, Optional
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
@@ -8,7 +13,14 @@ from sqlalchemy.ext.asyncio import (
     AsyncConnection,
 )
 
-from src.core import app_settings
+from src.core.config import app_settings
+from src.core.logging import get_logger
+from src.core.metrics import Counter, Gauge, Metric, instrument_engine, registry
+from src.core.pool_metrics import InstrumentedAsyncPool
+
+logger = get_logger("questions_answers.core.db_config")
+
+READ_PRIMARY_COOKIE = "qa_read_primary_until"
 
 
 async def get_async_session() -> AsyncSession:
@@ -19,18 +31,215 @@ async def get_async_session() -> AsyncSession:
             raise
 
 
+async def get_read_session(request: Request) -> AsyncSession:
+    session_factory = None
+    if not wrote_recently(request):
+        session_factory = replica_router.pick()
+    if session_factory is not None:
+        async with session_factory() as session:
+            if await connect_replica(session_factory, session):
+                yield session
+                return
+    async with async_session() as session:
+        try:
+            yield session
+        except Exception:
+            raise
+
+
+async def connect_replica(session_factory: async_sessionmaker, session: AsyncSession) -> bool:
+    """Получить соединение с репликой до выполнения запроса.
+
+    Если реплика недоступна, она помечается как сбойная, а чтение
+    выполняется с основной БД, и запрос не завершается ошибкой.
+    """
+    try:
+        await session.connection()
+        return True
+    except (DBAPIError, OSError) as e:
+        logger.warning(f"Не удалось подключиться к реплике, читаем с основной БД: {str(e)}")
+        replica_router.mark_failed(session_factory)
+        return False
+
+
+def wrote_recently(request: Request) -> bool:
+    """Клиент недавно изменял данные и должен читать их с основной БД"""
+    until = request.cookies.get(READ_PRIMARY_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
 def create_sessionmaker(
-    bind_engine: Union[AsyncEngine, AsyncConnection],
+    bind_engine: Union[AsyncEngine, AsyncConnection], **kwargs
 ) -> Callable[..., async_sessionmaker]:
     return async_sessionmaker(
         bind=bind_engine,
         expire_on_commit=False,
         class_=AsyncSession,
+        **kwargs,
+    )
+
+
+def create_engine(dsn: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        dsn,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=app_settings.db_pool_size,
+        max_overflow=app_settings.db_max_overflow,
+        pool_timeout=app_settings.db_pool_timeout,
+        pool_recycle=app_settings.db_pool_recycle,
+        pool_pre_ping=app_settings.db_pool_pre_ping,
+        connect_args={"statement_cache_size": app_settings.db_statement_cache_size},
+    )
+
+    @event.listens_for(new_engine.sync_engine, "handle_error")
+    def on_error(context):
+        if context.is_disconnect:
+            new_engine.pool.metrics.observe_failure()
+
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def pool_status(bind_engine: AsyncEngine) -> dict:
+    pool = bind_engine.pool
+    return pool.metrics.snapshot(pool)
+
+
+class ReplicaRouter:
+    """Распределение читающих сессий по репликам по кругу.
+
+    Реплика, на которой недавно не удалось установить соединение,
+    пропускается на replica_retry_seconds. Если подходящих реплик нет,
+    pick() возвращает None и чтение идет с основной БД.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._session_factories = [
+            create_sessionmaker(replica, info={"replica": True}) for replica in engines
+        ]
+        self._counter = itertools.count()
+
+    def pick(self) -> Optional[async_sessionmaker]:
+        if not self.engines:
+            return None
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if not self.engines[index].pool.metrics.failed_recently(self.retry_seconds):
+                return self._session_factories[index]
+        return None
+
+    def mark_failed(self, session_factory: async_sessionmaker) -> None:
+        metrics = self.engines[self._session_factories.index(session_factory)].pool.metrics
+        # Пул обычно уже учел ошибку подключения, повторно она не считается
+        if not metrics.failed_recently(self.retry_seconds):
+            metrics.observe_failure()
+
+
+# Движки создаются в init_engines() при запуске приложения, а не при импорте:
+# каждый воркер получает свои пулы, а импорт модуля не требует доступа к БД
+engine: Optional[AsyncEngine] = None
+
+async_session: Optional[async_sessionmaker] = None
+
+replica_router = ReplicaRouter([], retry_seconds=app_settings.replica_retry_seconds)
+
+
+def init_engines() -> None:
+    global engine, async_session, replica_router
+    if engine is not None:
+        return
+    engine = create_engine(str(app_settings.postgres_dsn))
+    async_session = create_sessionmaker(engine)
+    replica_router = ReplicaRouter(
+        [create_engine(dsn) for dsn in app_settings.postgres_replica_dsns],
+        retry_seconds=app_settings.replica_retry_seconds,
+    )
+
+
+async def dispose_engines() -> None:
+    global engine, async_session, replica_router
+    if engine is None:
+        return
+    await asyncio.gather(
+        engine.dispose(), *(replica.dispose() for replica in replica_router.engines)
     )
+    engine = None
+    async_session = None
+    replica_router = ReplicaRouter([], retry_seconds=app_settings.replica_retry_seconds)
 
 
-engine = create_async_engine(str(app_settings.postgres_dsn))
+async def prewarm_pool(bind_engine: AsyncEngine, count: int) -> int:
+    """Открыть до count соединений заранее и вернуть их в пул.
 
-async_session = create_sessionmaker(engine)
+    Открывается не больше размера пула: сверхлимитные соединения
+    закрываются сразу после возврата. Возвращает число открытых соединений.
+    """
+    count = min(count, bind_engine.pool.size())
+    results = await asyncio.gather(
+        *(bind_engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    connections = [result for result in results if isinstance(result, AsyncConnection)]
+    errors = [result for result in results if isinstance(result, Exception)]
+    for connection in connections:
+        await connection.close()
+    if errors:
+        logger.warning(
+            f"Не удалось заранее открыть {len(errors)} из {count} соединений: "
+            f"{str(errors[0])}"
+        )
+    return len(connections)
+
+
+async def prewarm_pools(count: int) -> int:
+    if engine is None or count <= 0:
+        return 0
+    opened = await asyncio.gather(
+        prewarm_pool(engine, count),
+        *(prewarm_pool(replica, count) for replica in replica_router.engines),
+    )
+    return sum(opened)
+
+
+def collect_pool_metrics() -> Iterable[Metric]:
+    connections = Gauge(
+        "db_pool_connections", "Соединения пула по состоянию", ("engine", "state")
+    )
+    checkouts = Counter("db_pool_checkouts_total", "Получено соединений из пула", ("engine",))
+    timeouts = Counter(
+        "db_pool_timeouts_total", "Таймауты ожидания соединения из пула", ("engine",)
+    )
+    failures = Counter(
+        "db_pool_failures_total", "Ошибки установки соединения с БД", ("engine",)
+    )
+    wait = Counter(
+        "db_pool_wait_seconds_total", "Суммарное время ожидания соединения", ("engine",)
+    )
+    waiting = Gauge("db_pool_waiting", "Запросы, ожидающие соединения из пула", ("engine",))
+    engines = [("primary", engine)] if engine is not None else []
+    engines += [
+        (f"replica-{index}", replica) for index, replica in enumerate(replica_router.engines)
+    ]
+    for name, bind_engine in engines:
+        pool = bind_engine.pool
+        snapshot = pool.metrics.snapshot(pool)
+        for state in ("checked_out", "idle", "overflow"):
+            connections.set(snapshot[state], (name, state))
+        checkouts.inc((name,), pool.metrics.checkouts)
+        timeouts.inc((name,), pool.metrics.timeouts)
+        failures.inc((name,), pool.metrics.failures)
+        wait.inc((name,), pool.metrics.wait_total)
+        waiting.set(pool.metrics.waiting, (name,))
+    return connections, checkouts, timeouts, failures, wait, waiting
+
+
+registry.add_collector(collect_pool_metrics)
 
 db_dependency = Annotated[AsyncSession, Depends(get_async_session)]
+
+read_db_dependency = Annotated[AsyncSession, Depends(get_read_session)]
@@ -1,15 +1,32 @@
+import atexit
+import copy
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-import json
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime, timezone
+from typing import Optional
+
+from src.core.config import app_settings
+
+try:
+    import orjson
+
+    def dumps(data: dict) -> str:
+        return orjson.dumps(data).decode("utf-8")
+
+except ImportError:  # pragma: no cover
+    import json
+
+    def dumps(data: dict) -> str:
+        return json.dumps(data, ensure_ascii=False)
 
 
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -20,15 +37,82 @@ class JSONFormatter(logging.Formatter):
 
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
-
-        return json.dumps(log_data, ensure_ascii=False)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
+
+        return dumps(log_data)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Передает записи в очередь, которую в отдельном потоке разбирает QueueListener.
+
+    Политики при переполнении очереди:
+    block - ждать освобождения места;
+    drop - молча отбросить запись;
+    count - отбросить запись и, как только место появится, записать,
+    сколько сообщений было потеряно.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "count"):
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record):
+        # Сообщение и traceback форматируются сразу, а JSON и запись в файл
+        # выполняются в потоке QueueListener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+            return
+        if self.overflow_policy == "count" and self._unreported:
+            self._report_dropped()
+
+    def _report_dropped(self):
+        warning = logging.LogRecord(
+            "questions_answers.logging",
+            logging.WARNING,
+            __file__,
+            0,
+            f"Очередь логов переполнена, потеряно сообщений: {self._unreported}",
+            None,
+            None,
+        )
+        try:
+            self.queue.put_nowait(warning)
+            self._unreported = 0
+        except queue.Full:
+            pass
+
+
+_listener: Optional[QueueListener] = None
 
 
 def setup_logging():
+    global _listener
+
+    logger = logging.getLogger("questions_answers")
+    if _listener is not None:
+        return logger
+
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
 
-    logger = logging.getLogger("questions_answers")
     logger.setLevel(logging.INFO)
 
     logger.handlers.clear()
@@ -48,16 +132,35 @@ def setup_logging():
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(JSONFormatter())
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    log_queue = queue.Queue(maxsize=app_settings.log_queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, app_settings.log_overflow_policy)
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+    logger.addHandler(queue_handler)
 
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
     return logger
 
 
-def get_logger(name: str):
-    return logging.getLogger(name)
+def stop_logging():
+    """Дописать накопленные в очереди записи и остановить поток логирования"""
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    # Записи после остановки пишутся напрямую, без очереди
+    logger = logging.getLogger("questions_answers")
+    logger.handlers.clear()
+    for handler in _listener.handlers:
+        logger.addHandler(handler)
+    _listener = None
 
 
-app_logger = setup_logging()
+def get_logger(name: str):
+    return logging.getLogger(name)
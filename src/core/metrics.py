@@ -0,0 +1,258 @@
+import bisect
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+# Ключ scope, в котором AdmissionMiddleware отмечает класс отклоненного запроса
+SHED_SCOPE_KEY = "admission_shed"
+
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+
+Labels = Tuple[str, ...]
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(str(v))}"' for name, v in pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(self.samples())
+        return lines
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, labels: Labels = (), value: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + value
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        self._values[labels] = value
+
+    def inc(self, labels: Labels = (), value: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + value
+
+    def dec(self, labels: Labels = (), value: float = 1) -> None:
+        self.inc(labels, -value)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Для каждого набора меток: счетчики по корзинам (последняя - +Inf) и сумма
+        self._histograms: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            histogram = self._histograms[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = histogram
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in self._histograms.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = format_labels(self.labelnames, labels, le=format_value(bound))
+                yield f"{self.name}_bucket{le} {cumulative}"
+            label_str = format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_str} {format_value(total[0])}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+
+class Registry:
+    """Метрики процесса в текстовом формате Prometheus.
+
+    Счетчики обновляются из цикла событий без блокировок, а значения, которые
+    уже хранятся в других объектах (пул, кэш), снимаются коллекторами
+    только в момент запроса /metrics.
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(
+    Counter(
+        "http_requests_total",
+        "Количество обработанных HTTP-запросов",
+        ("method", "route", "status"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP-запросы в обработке")
+)
+http_request_duration_seconds = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Время обработки HTTP-запроса",
+        ("method", "route", "status"),
+    )
+)
+http_request_db_queries = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Количество SQL-запросов на один HTTP-запрос",
+        ("method", "route"),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+db_query_duration_seconds = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Время выполнения SQL-запроса",
+        ("operation",),
+        buckets=DB_LATENCY_BUCKETS,
+    )
+)
+
+# Счетчик SQL-запросов текущего HTTP-запроса, заводится в MetricsMiddleware
+request_query_count: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_query_count", default=None
+)
+
+
+def sql_operation(statement: str) -> str:
+    words = statement.lstrip()[:7].split()
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Замерять время каждого SQL-запроса и считать запросы текущего HTTP-запроса"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+        query_count = request_query_count.get()
+        if query_count is not None:
+            query_count[0] += 1
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            db_query_duration_seconds.observe(
+                time.perf_counter() - start, (sql_operation(statement),)
+            )
+
+
+class MetricsMiddleware:
+    """Считает HTTP-запросы, время их обработки и число SQL-запросов.
+
+    Запросы группируются по шаблону маршрута (/questions/{question_id}),
+    а не по фактическому пути, чтобы число временных рядов не зависело от id.
+    Запросы, отклоненные ограничением нагрузки до маршрутизации, получают
+    маршрут shed:<класс>, а не unmatched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        query_count = [0]
+        token = request_query_count.set(query_count)
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            request_query_count.reset(token)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            if SHED_SCOPE_KEY in scope:
+                route_path = f"shed:{scope[SHED_SCOPE_KEY]}"
+            method = scope["method"]
+            status = str(status_code)
+            http_requests_total.inc((method, route_path, status))
+            http_request_duration_seconds.observe(duration, (method, route_path, status))
+            http_request_db_queries.observe(query_count[0], (method, route_path))
@@ -0,0 +1,39 @@
+import math
+import time
+
+from src.core.db_config import READ_PRIMARY_COOKIE
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReadYourWritesMiddleware:
+    """Отмечает клиента, изменившего данные, cookie с временем окончания окна.
+
+    Пока окно не истекло, читающие эндпоинты обслуживают клиента с основной БД,
+    и он видит свои изменения независимо от отставания реплик.
+    """
+
+    def __init__(self, app, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                cookie = (
+                    f"{READ_PRIMARY_COOKIE}={until:.3f}; "
+                    f"Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,91 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Накопительная статистика ожидания соединений из пула"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.waiting = 0
+        self.last_failure: Optional[float] = None
+        self.last_timeout: Optional[float] = None
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total += seconds
+        if seconds > self.wait_max:
+            self.wait_max = seconds
+
+    def observe_failure(self) -> None:
+        self.failures += 1
+        self.last_failure = time.monotonic()
+
+    def observe_timeout(self) -> None:
+        self.timeouts += 1
+        self.last_timeout = time.monotonic()
+
+    def failed_recently(self, seconds: float) -> bool:
+        return (
+            self.last_failure is not None and time.monotonic() - self.last_failure < seconds
+        )
+
+    def timed_out_recently(self, seconds: float) -> bool:
+        return (
+            self.last_timeout is not None and time.monotonic() - self.last_timeout < seconds
+        )
+
+    def snapshot(self, pool) -> Dict[str, Any]:
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "wait_avg_ms": (
+                round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Пул соединений, который замеряет время получения соединения"""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        self.metrics.waiting += 1
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        except Exception:
+            self.metrics.observe_failure()
+            raise
+        finally:
+            self.metrics.waiting -= 1
+        # Неудачные попытки учитываются в timeouts и failures, а не в checkouts
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -1,26 +1,69 @@
+import asyncio
 from fastapi import FastAPI
 import uvicorn
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
-from src.core import uvicorn_options
+from src.core import uvicorn_options, app_settings
+from src.core.config import connections_per_worker, max_primary_connections
+from src.core import db_config
 from src.api import api_router
-from src.core.logging import setup_logging, get_logger
+from src.core.logging import setup_logging, stop_logging, get_logger
+from src.core.admission import AdmissionMiddleware, admission_limiters
+from src.core.metrics import MetricsMiddleware
+from src.core.middleware import ReadYourWritesMiddleware
+from src.services.cache import question_cache, load_hot_keys, dump_hot_keys
+from src.services.questions_answers import answer_batcher, warm_question_cache
 
 setup_logging()
 logger = get_logger("questions_answers.main")
 
-env_path = Path(".") / (".env.docker" if os.getenv("DOCKER_MODE") else ".env")
-load_dotenv(env_path)
+
+async def warm_up_cache():
+    if question_cache.max_size <= 0:
+        return
+    hot_ids = load_hot_keys(app_settings.question_cache_hot_file)
+    hot_ids = hot_ids[: app_settings.question_cache_warm_size]
+    if not hot_ids:
+        return
+    try:
+        async with db_config.async_session() as db:
+            await warm_question_cache(db, hot_ids)
+    except Exception as e:
+        logger.warning(f"Не удалось прогреть кэш вопросов: {str(e)}")
+
+
+async def prewarm_pools():
+    try:
+        opened = await asyncio.wait_for(
+            db_config.prewarm_pools(app_settings.db_pool_prewarm),
+            timeout=app_settings.db_pool_prewarm_timeout,
+        )
+        logger.info(f"Заранее открыто соединений с БД: {opened}")
+    except Exception as e:
+        logger.warning(f"Не удалось заранее открыть соединения с БД: {str(e)}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Запуск приложения")
+    db_config.init_engines()
+    # Запросы начинают приниматься после выхода из этой части lifespan,
+    # поэтому первые запросы не ждут установки соединений
+    await prewarm_pools()
+    await warm_up_cache()
     yield
+    # Ответы, ожидающие групповой записи, записываются до остановки
+    await answer_batcher.drain()
+    # При выключенном кэше список популярных вопросов от прошлых запусков сохраняется
+    if question_cache.max_size > 0:
+        dump_hot_keys(
+            app_settings.question_cache_hot_file,
+            question_cache.most_requested(app_settings.question_cache_warm_size),
+        )
+    logger.info(f"Статистика кэша вопросов: {question_cache.stats()}")
+    await db_config.dispose_engines()
     logger.info("Отключение приложения")
+    stop_logging()
 
 
 app = FastAPI(
@@ -29,6 +72,21 @@ app = FastAPI(
 
 app.include_router(api_router)
 
+if app_settings.postgres_replica_dsns and app_settings.read_your_writes_seconds > 0:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window_seconds=app_settings.read_your_writes_seconds
+    )
+
+if app_settings.admission_enabled and admission_limiters:
+    app.add_middleware(
+        AdmissionMiddleware,
+        limiters=admission_limiters,
+        retry_after=app_settings.admission_retry_after,
+    )
+
+# Добавляется последним, чтобы время запроса включало работу остальных middleware
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/", tags=["root"])
 async def root():
@@ -36,4 +94,18 @@ async def root():
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", **uvicorn_options)
+    workers = uvicorn_options.get("workers", 1)
+    max_connections = max_primary_connections(app_settings)
+    if max_connections > app_settings.db_max_connections:
+        logger.warning(
+            f"Воркеров {workers} по {connections_per_worker(app_settings)} соединений "
+            f"превышают DB_MAX_CONNECTIONS={app_settings.db_max_connections}: уменьшите "
+            f"WORKERS, DB_POOL_SIZE или DB_MAX_OVERFLOW"
+        )
+    logger.info(
+        f"Запуск в режиме {app_settings.server_mode}: воркеров {workers}, "
+        f"до {max_connections} соединений с основной БД, "
+        f"кэш вопросов {'включен' if question_cache.max_size > 0 else 'выключен'}"
+    )
+    # Строка импорта, а не объект: воркеры и перезагрузка импортируют приложение сами
+    uvicorn.run("src.main:app", **uvicorn_options)
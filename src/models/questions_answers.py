@@ -1,29 +1,80 @@
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, FetchedValue, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from src.models.base import Base
 
+# Конфигурация полнотекстового поиска для колонок search_vector и запросов к ним
+SEARCH_CONFIG = "russian"
+
 
 class Question(Base):
     __tablename__ = "questions"
-    id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index("ix_questions_search_vector", "search_vector", postgresql_using="gin"),
+        # Покрывающие индексы под списки "больше всего ответов" и "недавно активные"
+        Index(
+            "ix_questions_answer_count_id",
+            "answer_count",
+            "id",
+            postgresql_include=["text", "created_at", "last_answer_at"],
+        ),
+        Index(
+            "ix_questions_last_answer_at_id",
+            "last_answer_at",
+            "id",
+            postgresql_include=["text", "created_at", "answer_count"],
+            postgresql_where=text("last_answer_at IS NOT NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True)
     text: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # to_tsvector(SEARCH_CONFIG, text), заполняется триггером, см. миграцию eca39fe71b2b
+    search_vector = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
+    # Поддерживаются триггерами на answers, см. миграцию 8d41f6a0c27e
+    answer_count: Mapped[int] = mapped_column(nullable=False, server_default="0")
+    last_answer_at = mapped_column(DateTime(timezone=True), nullable=True)
 
     answers: Mapped[list["Answer"]] = relationship(
-        "Answer", back_populates="question", cascade="all, delete-orphan"
+        "Answer",
+        back_populates="question",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
 class Answer(Base):
     __tablename__ = "answers"
-    id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True, index=True)
+    __table_args__ = (
+        Index("ix_answers_question_id_created_at_id", "question_id", "created_at", "id"),
+        Index("ix_answers_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_answers_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id: Mapped[int] = mapped_column(autoincrement=True, primary_key=True)
     question_id: Mapped[int] = mapped_column(
         ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
     )
     user_id: Mapped[str] = mapped_column(String(36), nullable=False)
     text: Mapped[str] = mapped_column(String(100), nullable=False)
     created_at = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # to_tsvector(SEARCH_CONFIG, text), заполняется триггером, см. миграцию eca39fe71b2b
+    search_vector = mapped_column(
+        TSVECTOR,
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        deferred=True,
+    )
 
     question = relationship("Question", back_populates="answers")
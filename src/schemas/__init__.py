@@ -1,13 +1,29 @@
 from src.schemas.questions_answers import (
     AnswerCreate,
     AnswerRead,
+    AnswersByIds,
+    BulkDeleteResult,
+    BulkItemError,
+    QuestionBulkResult,
     QuestionCreate,
     QuestionRead,
+    QuestionSearchResult,
+    QuestionSummary,
+    QuestionsByIds,
+    UserAnswerRead,
 )
 
 __all__ = [
     "AnswerCreate",
     "AnswerRead",
+    "AnswersByIds",
+    "BulkDeleteResult",
+    "BulkItemError",
+    "QuestionBulkResult",
     "QuestionCreate",
     "QuestionRead",
+    "QuestionSearchResult",
+    "QuestionSummary",
+    "QuestionsByIds",
+    "UserAnswerRead",
 ]
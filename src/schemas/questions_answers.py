@@ -1,11 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
 class AnswerCreate(BaseModel):
-    user_id: str = Field(..., min_length=1, description="Идентификатор пользователя")
-    text: str = Field(..., min_length=1, description="Текст ответа")
+    user_id: str = Field(
+        ..., min_length=1, max_length=36, description="Идентификатор пользователя"
+    )
+    text: str = Field(..., min_length=1, max_length=100, description="Текст ответа")
 
 
 class AnswerRead(BaseModel):
@@ -18,8 +20,14 @@ class AnswerRead(BaseModel):
     created_at: datetime
 
 
+class UserAnswerRead(AnswerRead):
+    question_text: Optional[str] = Field(
+        None, description="Текст вопроса, если запрошен with_question=true"
+    )
+
+
 class QuestionCreate(BaseModel):
-    text: str = Field(..., min_length=1, description="Текст вопроса")
+    text: str = Field(..., min_length=1, max_length=100, description="Текст вопроса")
 
 
 class QuestionRead(BaseModel):
@@ -29,3 +37,52 @@ class QuestionRead(BaseModel):
     text: str
     created_at: datetime
     answers: List[AnswerRead] = Field(default_factory=list)
+
+
+class QuestionSummary(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    text: str
+    created_at: datetime
+    answer_count: int
+    last_answer_at: Optional[datetime] = None
+
+
+class QuestionSearchResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    text: str
+    created_at: datetime
+    rank: float
+    headline: str = Field(..., description="Текст вопроса с выделенными совпадениями")
+    answer_id: Optional[int] = Field(None, description="Наиболее подходящий ответ")
+    answer_headline: Optional[str] = Field(
+        None, description="Текст этого ответа с выделенными совпадениями"
+    )
+
+
+class BulkItemError(BaseModel):
+    index: int
+    message: str
+
+
+class QuestionBulkResult(BaseModel):
+    created: List[QuestionRead]
+    errors: List[BulkItemError] = Field(default_factory=list)
+
+
+class BulkDeleteResult(BaseModel):
+    deleted: List[int]
+    not_found: List[int]
+
+
+class QuestionsByIds(BaseModel):
+    items: List[QuestionRead]
+    missing: List[int]
+
+
+class AnswersByIds(BaseModel):
+    items: List[AnswerRead]
+    missing: List[int]
@@ -1,19 +1,45 @@
 from src.services.questions_answers import (
     get_all_questions,
+    get_questions_summary,
+    stream_questions,
+    search_questions,
     get_question_with_answers,
+    get_question_snapshot,
+    get_questions_by_ids,
+    get_question_version,
+    warm_question_cache,
     create_question,
+    create_questions_bulk,
     delete_question,
+    delete_questions_bulk,
     create_answer,
+    create_answers_bulk,
     get_answer,
+    get_answers_by_ids,
+    get_user_answers,
     delete_answer,
+    delete_answers_bulk,
 )
 
 __all__ = [
     "get_all_questions",
+    "get_questions_summary",
+    "stream_questions",
+    "search_questions",
     "get_question_with_answers",
+    "get_question_snapshot",
+    "get_questions_by_ids",
+    "get_question_version",
+    "warm_question_cache",
     "create_question",
+    "create_questions_bulk",
     "delete_question",
+    "delete_questions_bulk",
     "create_answer",
+    "create_answers_bulk",
     "get_answer",
+    "get_answers_by_ids",
+    "get_user_answers",
     "delete_answer",
+    "delete_answers_bulk",
 ]
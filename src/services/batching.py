@@ -0,0 +1,92 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar, Union
+
+from src.core.logging import get_logger
+from src.core import metrics
+
+logger = get_logger("questions_answers.services.batching")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+write_batch_size = metrics.registry.register(
+    metrics.Histogram(
+        "write_batch_size",
+        "Количество записей в одной пакетной транзакции",
+        ("name",),
+        buckets=BATCH_SIZE_BUCKETS,
+    )
+)
+
+
+class WriteBatcher(Generic[T, R]):
+    """Групповая запись: одновременные записи объединяются в одну транзакцию.
+
+    Первая запись открывает окно в window секунд, пакет записывается по
+    истечении окна или при наборе max_items записей. Функция flush получает
+    записи пакета и возвращает для каждой результат или исключение, поэтому
+    каждый вызывающий получает свой результат или свою ошибку. Если flush
+    выбросил исключение, его получают все записи пакета.
+
+    Запись, чей вызывающий отменен до записи пакета, в пакет не попадает.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[T]], Awaitable[List[Union[R, Exception]]]],
+        window: float,
+        max_items: int,
+    ):
+        self.name = name
+        self.flush = flush
+        self.window = window
+        self.max_items = max_items
+        self._pending: List[Tuple[T, "asyncio.Future[R]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_pending)
+        return await future
+
+    async def drain(self) -> None:
+        """Записать накопленный пакет и дождаться всех начатых записей"""
+        self._flush_pending()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        task = asyncio.create_task(self._write(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        write_batch_size.observe(len(batch), (self.name,))
+        try:
+            outcomes = await self.flush([item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Ошибка при записи пакета {self.name} из {len(batch)}: {str(e)}")
+            outcomes = [e] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -0,0 +1,199 @@
+import json
+import os
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.core.config import app_settings, question_cache_size
+from src.core.logging import get_logger
+from src.core import metrics
+
+logger = get_logger("questions_answers.services.cache")
+
+
+class AnswerSnapshot(NamedTuple):
+    id: int
+    question_id: int
+    user_id: str
+    text: str
+    created_at: datetime
+
+
+class QuestionSnapshot(NamedTuple):
+    id: int
+    text: str
+    created_at: datetime
+    answers: Tuple[AnswerSnapshot, ...]
+
+    @classmethod
+    def from_model(cls, question) -> "QuestionSnapshot":
+        """Снять неизменяемую копию с ORM-объекта вопроса с загруженными ответами"""
+        return cls(
+            id=question.id,
+            text=question.text,
+            created_at=question.created_at,
+            answers=tuple(
+                AnswerSnapshot(a.id, a.question_id, a.user_id, a.text, a.created_at)
+                for a in question.answers
+            ),
+        )
+
+
+def answers_version(answers: Iterable) -> Tuple[int, int]:
+    """Версия набора ответов вопроса: количество и максимальный id.
+
+    Ответы не изменяются, а id только растут, поэтому любое добавление
+    или удаление ответа меняет эту пару.
+    """
+    count, last_id = 0, 0
+    for answer in answers:
+        count += 1
+        last_id = max(last_id, answer.id)
+    return count, last_id
+
+
+class LRUTTLCache:
+    """Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Кэш живет в памяти процесса и не разделяется между воркерами.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._requests: Counter = Counter()
+        self._invalidated_at: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._key_versions: Dict[Hashable, int] = {}
+        self._version = 0
+        # Версия ключей без своей версии: не меньше версии любого забытого ключа,
+        # поэтому загрузка, начатая до инвалидации вытесненного ключа, отбрасывается
+        self._base_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        self._count_request(key)
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def token(self, key: Hashable) -> int:
+        """Версия ключа до начала загрузки значения, передается в set().
+
+        Меняется при инвалидации этого ключа или очистке всего кэша, а для
+        ключей без своей версии - и при вытеснении версии другого ключа.
+        """
+        return self._key_versions.get(key, self._base_version)
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        # Значение, загруженное до инвалидации ключа, могло устареть
+        if token is not None and token != self.token(key):
+            return
+        if self.max_size <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._version += 1
+        self._key_versions[key] = self._version
+        self._invalidated_at[key] = time.monotonic()
+        self._invalidated_at.move_to_end(key)
+        if len(self._invalidated_at) > self.max_size:
+            oldest, _ = self._invalidated_at.popitem(last=False)
+            evicted = self._key_versions.pop(oldest, self._base_version)
+            self._base_version = max(self._base_version, evicted)
+        if self._data.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidated_within(self, key: Hashable, seconds: float) -> bool:
+        invalidated_at = self._invalidated_at.get(key)
+        return invalidated_at is not None and time.monotonic() - invalidated_at < seconds
+
+    def clear(self) -> None:
+        self._version += 1
+        self._base_version = self._version
+        self._key_versions.clear()
+        self._data.clear()
+
+    def most_requested(self, n: int) -> List[Hashable]:
+        return [key for key, _ in self._requests.most_common(n)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _count_request(self, key: Hashable) -> None:
+        if self.max_size <= 0:
+            return
+        self._requests[key] += 1
+        # Счетчик обращений не должен расти без ограничений
+        if len(self._requests) > self.max_size * 10:
+            self._requests = Counter(dict(self._requests.most_common(self.max_size)))
+
+
+def load_hot_keys(path: Path) -> List[int]:
+    try:
+        return [int(key) for key in json.loads(path.read_text(encoding="utf-8"))]
+    except FileNotFoundError:
+        return []
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Не удалось прочитать список популярных вопросов {path}: {str(e)}")
+        return []
+
+
+def dump_hot_keys(path: Path, keys: List[int]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Запись во временный файл и замена, чтобы при сбое не остался обрезанный JSON
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(keys), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Не удалось сохранить список популярных вопросов {path}: {str(e)}")
+
+
+question_cache = LRUTTLCache(
+    max_size=question_cache_size(app_settings), ttl=app_settings.question_cache_ttl
+)
+
+
+def collect_cache_metrics() -> Iterable[metrics.Metric]:
+    stats = question_cache.stats()
+    size = metrics.Gauge("question_cache_entries", "Записей в кэше вопросов")
+    size.set(stats["size"])
+    events = metrics.Counter(
+        "question_cache_events_total", "Обращения и вытеснения в кэше вопросов", ("event",)
+    )
+    for name in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        events.inc((name,), stats[name])
+    return size, events
+
+
+metrics.registry.add_collector(collect_cache_metrics)
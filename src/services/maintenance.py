@@ -0,0 +1,97 @@
+"""Обслуживание данных.
+
+Пересчет answer_count и last_answer_at у вопросов, если они разошлись
+с таблицей ответов (например, после ручных правок в обход триггеров):
+
+    python -m src.services.maintenance repair-answer-stats --batch-size 1000
+"""
+
+import argparse
+import asyncio
+from typing import List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import db_config
+from src.core.logging import get_logger, setup_logging
+from src.models.questions_answers import Answer, Question
+
+logger = get_logger("questions_answers.services.maintenance")
+
+
+async def repair_answer_stats(db: AsyncSession, batch_size: int = 1000) -> int:
+    """Пересчитать статистику ответов по диапазонам id, каждый в своей транзакции.
+
+    Вопросы диапазона блокируются до пересчета: триггеры на answers обновляют
+    те же строки, поэтому параллельно добавленные ответы не потеряются.
+    Возвращает количество исправленных вопросов.
+    """
+    logger.info(f"Пересчитываем статистику ответов, размер пакета {batch_size}")
+    try:
+        max_id = await db.scalar(select(func.max(Question.id)))
+        await db.commit()
+        repaired = 0
+        for start in range(0, max_id or 0, batch_size):
+            in_batch = Question.id.between(start + 1, start + batch_size)
+            await db.execute(select(Question.id).where(in_batch).with_for_update())
+            stats = (
+                select(
+                    Question.id.label("id"),
+                    func.count(Answer.id).label("answer_count"),
+                    func.max(Answer.created_at).label("last_answer_at"),
+                )
+                .outerjoin(Answer, Answer.question_id == Question.id)
+                .where(in_batch)
+                .group_by(Question.id)
+                .subquery("stats")
+            )
+            result = await db.execute(
+                update(Question)
+                .where(
+                    Question.id == stats.c.id,
+                    or_(
+                        Question.answer_count != stats.c.answer_count,
+                        Question.last_answer_at.is_distinct_from(stats.c.last_answer_at),
+                    ),
+                )
+                .values(
+                    answer_count=stats.c.answer_count, last_answer_at=stats.c.last_answer_at
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            repaired += result.rowcount
+        logger.info(f"Статистика ответов пересчитана, исправлено вопросов: {repaired}")
+        return repaired
+    except Exception as e:
+        logger.error(f"Ошибка при пересчете статистики ответов: {str(e)}")
+        await db.rollback()
+        raise
+
+
+async def run_repair_answer_stats(batch_size: int) -> int:
+    db_config.init_engines()
+    try:
+        async with db_config.async_session() as db:
+            return await repair_answer_stats(db, batch_size)
+    finally:
+        await db_config.dispose_engines()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Обслуживание данных вопросов и ответов")
+    commands = parser.add_subparsers(dest="command", required=True)
+    repair = commands.add_parser(
+        "repair-answer-stats", help="Пересчитать answer_count и last_answer_at"
+    )
+    repair.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.command == "repair-answer-stats":
+        asyncio.run(run_repair_answer_stats(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
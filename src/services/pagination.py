@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def _pack(values: List[Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _unpack(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Упаковать позицию (created_at, id) в непрозрачный курсор"""
+    return _pack([created_at.isoformat(), item_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Распаковать курсор, при некорректном значении выбрасывает ValueError"""
+    try:
+        created_at, item_id = _unpack(cursor)
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Некорректный курсор: {cursor}") from e
+
+
+def encode_rank_cursor(rank: float, item_id: int) -> str:
+    """Упаковать позицию (релевантность, id) в результатах поиска"""
+    return _pack([rank, item_id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, item_id = _unpack(cursor)
+        return float(rank), int(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Некорректный курсор: {cursor}") from e
+
+
+def encode_count_cursor(count: int, item_id: int) -> str:
+    """Упаковать позицию (количество, id) для сортировки по числу ответов"""
+    return _pack([count, item_id])
+
+
+def decode_count_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        count, item_id = _unpack(cursor)
+        return int(count), int(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Некорректный курсор: {cursor}") from e
@@ -1,19 +1,68 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.future import select
 
-from src.models.questions_answers import Question, Answer
-from src.schemas.questions_answers import QuestionCreate, AnswerCreate
+from src.core import db_config
+from src.core.config import app_settings
+from src.services.batching import WriteBatcher
+from src.services.cache import QuestionSnapshot, question_cache
+from src.services.singleflight import SingleFlight
+from src.models.questions_answers import Question, Answer, SEARCH_CONFIG
+from src.schemas.questions_answers import (
+    QuestionCreate,
+    QuestionRead,
+    QuestionSearchResult,
+    AnswerCreate,
+    AnswerRead,
+)
 from src.core.logging import get_logger
 
 logger = get_logger("questions_answers.services")
 
+FOREIGN_KEY_VIOLATION = "23503"
 
-async def get_all_questions(db: AsyncSession) -> List[Question]:
-    logger.info("Получаем список всех вопросов")
+SummarySort = Literal["created", "answers", "activity"]
+
+# Тексты не длиннее 100 символов, поэтому выделяются целиком, без фрагментов
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, HighlightAll=TRUE"
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+
+
+async def get_all_questions(
+    db: AsyncSession,
+    limit: int = app_settings.page_size_default,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> List[Question]:
+    logger.info(f"Получаем страницу вопросов: limit={limit}, after={after}")
     try:
-        result = await db.execute(select(Question).options(selectinload(Question.answers)))
+        query = (
+            select(Question)
+            .options(selectinload(Question.answers))
+            .order_by(Question.created_at, Question.id)
+            .limit(min(limit, app_settings.page_size_max))
+        )
+        if after is not None:
+            query = query.where(tuple_(Question.created_at, Question.id) > tuple_(*after))
+        result = await db.execute(query)
         questions = list(result.scalars().all())
         logger.info(f"Успешно получили {len(questions)} вопросов")
         return questions
@@ -22,6 +71,163 @@ async def get_all_questions(db: AsyncSession) -> List[Question]:
         raise
 
 
+async def get_questions_summary(
+    db: AsyncSession,
+    limit: int = app_settings.page_size_default,
+    after: Optional[Tuple[Any, int]] = None,
+    sort: SummarySort = "created",
+) -> List[Row]:
+    """Краткий список вопросов без загрузки ответов.
+
+    created - по времени создания, answers - по убыванию числа ответов,
+    activity - по убыванию времени последнего ответа (только вопросы с ответами).
+    """
+    logger.info(
+        f"Получаем краткий список вопросов: limit={limit}, after={after}, sort={sort}"
+    )
+    try:
+        query = select(
+            Question.id,
+            Question.text,
+            Question.created_at,
+            Question.answer_count,
+            Question.last_answer_at,
+        ).limit(min(limit, app_settings.page_size_max))
+        if sort == "answers":
+            position = tuple_(Question.answer_count, Question.id)
+            query = query.order_by(Question.answer_count.desc(), Question.id.desc())
+            if after is not None:
+                query = query.where(position < tuple_(*after))
+        elif sort == "activity":
+            position = tuple_(Question.last_answer_at, Question.id)
+            query = query.where(Question.last_answer_at.is_not(None)).order_by(
+                Question.last_answer_at.desc(), Question.id.desc()
+            )
+            if after is not None:
+                query = query.where(position < tuple_(*after))
+        else:
+            position = tuple_(Question.created_at, Question.id)
+            query = query.order_by(Question.created_at, Question.id)
+            if after is not None:
+                query = query.where(position > tuple_(*after))
+        result = await db.execute(query)
+        questions = list(result.all())
+        logger.info(f"Успешно получили краткий список из {len(questions)} вопросов")
+        return questions
+    except Exception as e:
+        logger.error(f"Ошибка при получении краткого списка вопросов: {str(e)}")
+        raise
+
+
+async def stream_questions(db: AsyncSession) -> AsyncIterator[Question]:
+    logger.info("Начинаем потоковую выгрузку вопросов")
+    try:
+        result = await db.stream(
+            select(Question)
+            .options(selectinload(Question.answers))
+            .order_by(Question.created_at, Question.id)
+            .execution_options(yield_per=app_settings.export_batch_size)
+        )
+        count = 0
+        async for question in result.scalars():
+            count += 1
+            yield question
+        logger.info(f"Успешно выгружено {count} вопросов")
+    except Exception as e:
+        logger.error(f"Ошибка при потоковой выгрузке вопросов: {str(e)}")
+        raise
+
+
+async def search_questions(
+    db: AsyncSession,
+    search_text: str,
+    include_answers: bool = False,
+    limit: int = app_settings.page_size_default,
+    after: Optional[Tuple[float, int]] = None,
+) -> List[QuestionSearchResult]:
+    """Полнотекстовый поиск вопросов по убыванию релевантности.
+
+    При include_answers вопрос находится и по тексту ответов, а его
+    релевантность - лучшая из релевантностей вопроса и ответов.
+    Подсветка совпадений считается только для строк текущей страницы.
+    """
+    logger.info(
+        f"Ищем вопросы: q={search_text[:25]}, answers={include_answers}, limit={limit}"
+    )
+    try:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search_text)
+        matches = select(
+            Question.id.label("id"),
+            func.ts_rank(Question.search_vector, ts_query).label("rank"),
+        ).where(Question.search_vector.bool_op("@@")(ts_query))
+        if include_answers:
+            found = union_all(
+                matches,
+                select(
+                    Answer.question_id.label("id"),
+                    func.ts_rank(Answer.search_vector, ts_query).label("rank"),
+                ).where(Answer.search_vector.bool_op("@@")(ts_query)),
+            ).subquery("found")
+            matches = select(found.c.id, func.max(found.c.rank).label("rank")).group_by(
+                found.c.id
+            )
+        matches = matches.subquery("matches")
+
+        page = (
+            select(matches.c.id, matches.c.rank)
+            .order_by(matches.c.rank.desc(), matches.c.id.desc())
+            .limit(min(limit, app_settings.page_size_max))
+        )
+        if after is not None:
+            page = page.where(tuple_(matches.c.rank, matches.c.id) < tuple_(*after))
+        page = page.subquery("page")
+
+        result = await db.execute(
+            select(
+                Question.id,
+                Question.text,
+                Question.created_at,
+                page.c.rank,
+                func.ts_headline(
+                    SEARCH_CONFIG, Question.text, ts_query, HEADLINE_OPTIONS
+                ).label("headline"),
+            )
+            .join(page, page.c.id == Question.id)
+            .order_by(page.c.rank.desc(), Question.id.desc())
+        )
+        questions = [QuestionSearchResult.model_validate(row) for row in result.all()]
+
+        if include_answers and questions:
+            # Для каждого вопроса страницы - лучший из подходящих ответов
+            best_answers = await db.execute(
+                select(
+                    Answer.question_id,
+                    Answer.id,
+                    func.ts_headline(SEARCH_CONFIG, Answer.text, ts_query, HEADLINE_OPTIONS),
+                )
+                .where(
+                    Answer.question_id.in_([question.id for question in questions]),
+                    Answer.search_vector.bool_op("@@")(ts_query),
+                )
+                .order_by(
+                    Answer.question_id,
+                    func.ts_rank(Answer.search_vector, ts_query).desc(),
+                    Answer.id,
+                )
+                .distinct(Answer.question_id)
+            )
+            by_question = {row[0]: row for row in best_answers.all()}
+            for question in questions:
+                if question.id in by_question:
+                    _, question.answer_id, question.answer_headline = by_question[question.id]
+
+        logger.info(f"Найдено {len(questions)} вопросов")
+        return questions
+    except Exception as e:
+        logger.error(f"Ошибка при поиске вопросов: {str(e)}")
+        raise
+
+
 async def get_question_with_answers(db: AsyncSession, question_id: int) -> Optional[Question]:
     logger.info(f"Получаем вопрос с ID {question_id}")
     try:
@@ -44,19 +250,146 @@ async def get_question_with_answers(db: AsyncSession, question_id: int) -> Optio
         raise
 
 
-async def create_question(db: AsyncSession, question: QuestionCreate) -> Question:
-    logger.info(f"Создаем вопрос: {question.text[:25]}...")
+async def get_question_snapshot(
+    db: AsyncSession, question_id: int
+) -> Optional[QuestionSnapshot]:
+    snapshot = question_cache.get(question_id)
+    if snapshot is not None:
+        logger.info(f"Вопрос с ID {question_id} получен из кэша")
+        return snapshot
+
+    return await question_loads.do(load_question_snapshot, db, question_id)
+
+
+async def load_question_snapshot(
+    db: AsyncSession, question_id: int
+) -> Optional[QuestionSnapshot]:
+    token = question_cache.token(question_id)
+    question = await get_question_with_answers(db, question_id)
+    if question is None:
+        return None
+    snapshot = QuestionSnapshot.from_model(question)
+    cache_snapshot(db, snapshot, token)
+    return snapshot
+
+
+def question_load_key(db: AsyncSession, question_id: int) -> Tuple[int, bool, int]:
+    """Ключ общей загрузки вопроса.
+
+    Чтение с реплики не объединяется с чтением с основной БД, иначе клиент,
+    который должен видеть свои изменения, получил бы данные реплики. Версия вопроса
+    в кэше отделяет запросы, пришедшие после изменения этого вопроса, от
+    загрузки, начатой до него.
+    """
+    return question_id, db.info.get("replica") is True, question_cache.token(question_id)
+
+
+question_loads = SingleFlight(
+    "question", key=question_load_key, enabled=app_settings.question_single_flight
+)
+
+
+def cache_snapshot(db: AsyncSession, snapshot: QuestionSnapshot, token: int) -> None:
+    # Реплика могла еще не получить недавнее изменение, такой снимок не кэшируем
+    if not (
+        db.info.get("replica") is True
+        and question_cache.invalidated_within(
+            snapshot.id, app_settings.replica_max_lag_seconds
+        )
+    ):
+        question_cache.set(snapshot.id, snapshot, token)
+
+
+async def get_questions_by_ids(
+    db: AsyncSession, question_ids: List[int]
+) -> Dict[int, QuestionSnapshot]:
+    """Вопросы с ответами по списку id: из кэша, а остальные одним запросом"""
+    logger.info(f"Получаем {len(question_ids)} вопросов по списку id")
+    found: Dict[int, QuestionSnapshot] = {}
+    for question_id in question_ids:
+        snapshot = question_cache.get(question_id)
+        if snapshot is not None:
+            found[question_id] = snapshot
+    missing = [question_id for question_id in question_ids if question_id not in found]
+    if not missing:
+        logger.info(f"Все {len(found)} вопросов получены из кэша")
+        return found
     try:
-        new_question = Question(text=question.text)
-        db.add(new_question)
-        await db.commit()
-        await db.refresh(new_question, attribute_names=["answers"])
+        tokens = {question_id: question_cache.token(question_id) for question_id in missing}
+        result = await db.execute(
+            select(Question)
+            .options(selectinload(Question.answers))
+            .where(Question.id == any_(bindparam("ids", missing, type_=ARRAY(Integer))))
+        )
+        for question in result.scalars().all():
+            snapshot = QuestionSnapshot.from_model(question)
+            cache_snapshot(db, snapshot, tokens[question.id])
+            found[question.id] = snapshot
+        logger.info(
+            f"Успешно получено {len(found)} из {len(question_ids)} вопросов, "
+            f"из БД загружено {len(found) - (len(question_ids) - len(missing))}"
+        )
+        return found
+    except Exception as e:
+        logger.error(f"Ошибка при получении вопросов по списку id: {str(e)}")
+        raise
+
+
+async def get_question_version(
+    db: AsyncSession, question_id: int
+) -> Optional[Tuple[int, int]]:
+    """Количество ответов и максимальный id ответа без загрузки самих ответов.
+
+    Версия всегда берется из БД, а не из кэша: запись кэша могла устареть
+    после изменения, сделанного через другой воркер.
+    """
+    try:
+        result = await db.execute(
+            select(func.count(Answer.id), func.coalesce(func.max(Answer.id), 0))
+            .select_from(Question)
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(Question.id == question_id)
+            .group_by(Question.id)
+        )
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+    except Exception as e:
+        logger.error(f"Ошибка при получении версии вопроса с ID {question_id}: {str(e)}")
+        raise
+
+
+async def warm_question_cache(db: AsyncSession, question_ids: List[int]) -> int:
+    logger.info(f"Прогреваем кэш для {len(question_ids)} вопросов")
+    try:
+        tokens = {
+            question_id: question_cache.token(question_id) for question_id in question_ids
+        }
         result = await db.execute(
             select(Question)
             .options(selectinload(Question.answers))
-            .where(Question.id == new_question.id)
+            .where(Question.id.in_(question_ids))
         )
-        created_question = result.scalar_one()
+        questions = list(result.scalars().all())
+        for question in questions:
+            question_cache.set(
+                question.id, QuestionSnapshot.from_model(question), tokens[question.id]
+            )
+        logger.info(f"Кэш прогрет: загружено {len(questions)} вопросов")
+        return len(questions)
+    except Exception as e:
+        logger.error(f"Ошибка при прогреве кэша вопросов: {str(e)}")
+        raise
+
+
+async def create_question(db: AsyncSession, question: QuestionCreate) -> Question:
+    logger.info(f"Создаем вопрос: {question.text[:25]}...")
+    try:
+        created_question = await db.scalar(
+            insert(Question).values(text=question.text).returning(Question)
+        )
+        # Новый вопрос не имеет ответов, повторно читать их из БД не нужно
+        set_committed_value(created_question, "answers", [])
+        await db.commit()
         logger.info(f"Успешно создан вопрос с ID {created_question.id}")
         return created_question
     except Exception as e:
@@ -65,17 +398,48 @@ async def create_question(db: AsyncSession, question: QuestionCreate) -> Questio
         raise
 
 
+async def create_questions_bulk(
+    db: AsyncSession, questions: List[QuestionCreate]
+) -> List[QuestionRead]:
+    logger.info(f"Создаем {len(questions)} вопросов одним запросом")
+    if not questions:
+        return []
+    try:
+        result = await db.execute(
+            insert(Question).returning(
+                Question.id, Question.text, Question.created_at, sort_by_parameter_order=True
+            ),
+            [{"text": question.text} for question in questions],
+        )
+        created = [
+            QuestionRead(id=row.id, text=row.text, created_at=row.created_at)
+            for row in result.all()
+        ]
+        await db.commit()
+        logger.info(f"Успешно создано {len(created)} вопросов")
+        return created
+    except Exception as e:
+        logger.error(f"Ошибка при массовом создании вопросов: {str(e)}")
+        await db.rollback()
+        raise
+
+
 async def delete_question(db: AsyncSession, question_id: int) -> bool:
     logger.info(f"Удаляем вопрос с ID {question_id}")
     try:
-        result = await db.execute(select(Question).where(Question.id == question_id))
-        question = result.scalar_one_or_none()
-        if not question:
+        # Ответы удаляет сама БД через ON DELETE CASCADE
+        deleted_id = await db.scalar(
+            delete(Question)
+            .where(Question.id == question_id)
+            .returning(Question.id)
+            .execution_options(synchronize_session=False)
+        )
+        if deleted_id is None:
             logger.warning(f"Вопрос c ID {question_id} не найден")
             return False
 
-        await db.delete(question)
         await db.commit()
+        question_cache.invalidate(question_id)
         logger.info(f"Успешно удален вопрос с ID {question_id}")
         return True
     except Exception as e:
@@ -83,27 +447,174 @@ async def delete_question(db: AsyncSession, question_id: int) -> bool:
         raise
 
 
+async def delete_questions_bulk(db: AsyncSession, question_ids: List[int]) -> List[int]:
+    logger.info(f"Удаляем {len(question_ids)} вопросов")
+    try:
+        result = await db.execute(
+            delete(Question)
+            .where(Question.id.in_(question_ids))
+            .returning(Question.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = list(result.scalars().all())
+        await db.commit()
+        for question_id in deleted_ids:
+            question_cache.invalidate(question_id)
+        logger.info(f"Успешно удалено {len(deleted_ids)} вопросов")
+        return deleted_ids
+    except Exception as e:
+        logger.error(f"Ошибка при массовом удалении вопросов: {str(e)}")
+        await db.rollback()
+        raise
+
+
 async def create_answer(
     db: AsyncSession, question_id: int, answer: AnswerCreate
-) -> Optional[Answer]:
+) -> Optional[Union[Answer, AnswerRead]]:
     logger.info(f"Создаем ответ для вопроса с ID {question_id}")
+    if app_settings.answer_batch_enabled:
+        new_answer = await answer_batcher.submit((question_id, answer))
+    else:
+        new_answer = await insert_answer(db, question_id, answer)
+    if new_answer is None:
+        logger.warning(f"Вопрос с ID {question_id} не найден при создании ответа")
+        return None
+
+    question_cache.invalidate(question_id)
+    logger.info(f"Успешно создан ответ с ID {new_answer.id} для вопроса с ID {question_id}")
+    return new_answer
+
+
+async def insert_answer(
+    db: AsyncSession, question_id: int, answer: AnswerCreate
+) -> Optional[Answer]:
     try:
-        q_result = await db.execute(select(Question).where(Question.id == question_id))
-        question = q_result.scalar_one_or_none()
-        if not question:
-            logger.warning(f"Вопрос с ID {question_id} не найден при создании ответа")
+        new_answer = await db.scalar(
+            insert(Answer)
+            .values(question_id=question_id, user_id=answer.user_id, text=answer.text)
+            .returning(Answer)
+        )
+        await db.commit()
+        return new_answer
+    except IntegrityError as e:
+        await db.rollback()
+        if is_foreign_key_violation(e):
             return None
+        logger.error(f"Ошибка при создании ответа к вопросу с ID {question_id}: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка при создании ответа к вопросу с ID {question_id}: {str(e)}")
+        raise
+
+
+ANSWER_COLUMNS = (
+    Answer.id,
+    Answer.question_id,
+    Answer.user_id,
+    Answer.text,
+    Answer.created_at,
+)
+
 
-        new_answer = Answer(question_id=question_id, user_id=answer.user_id, text=answer.text)
-        db.add(new_answer)
+async def insert_answers_batch(
+    items: List[Tuple[int, AnswerCreate]],
+) -> List[Union[Optional[AnswerRead], Exception]]:
+    """Записать ответы разных запросов одной транзакцией и одним INSERT.
+
+    Сессия открывается своя: пакет собирается из нескольких HTTP-запросов.
+    Если вопрос одного из ответов удален, многострочный INSERT отклоняется
+    целиком, тогда ответы пакета записываются по одному в точках сохранения
+    той же транзакции, а для ответа к удаленному вопросу возвращается None.
+    """
+    logger.info(f"Записываем пакет из {len(items)} ответов")
+    values = [
+        {"question_id": question_id, "user_id": answer.user_id, "text": answer.text}
+        for question_id, answer in items
+    ]
+    async with db_config.async_session() as db:
+        try:
+            result = await db.execute(
+                insert(Answer).returning(*ANSWER_COLUMNS, sort_by_parameter_order=True),
+                values,
+            )
+            created = [AnswerRead.model_validate(row) for row in result.all()]
+            await db.commit()
+            logger.info(f"Пакет из {len(created)} ответов записан")
+            return created
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_foreign_key_violation(e):
+                raise
+            logger.warning("Вопрос одного из ответов пакета не найден, записываем по одному")
+
+        outcomes: List[Union[Optional[AnswerRead], Exception]] = []
+        for row in values:
+            try:
+                async with db.begin_nested():
+                    result = await db.execute(
+                        insert(Answer).values(**row).returning(*ANSWER_COLUMNS)
+                    )
+                    outcomes.append(AnswerRead.model_validate(result.one()))
+            except IntegrityError as e:
+                outcomes.append(None if is_foreign_key_violation(e) else e)
         await db.commit()
-        await db.refresh(new_answer)
-        logger.info(
-            f"Успешно создан ответ с ID {new_answer.id} для вопроса с ID {question_id}"
+        return outcomes
+
+
+answer_batcher: WriteBatcher[Tuple[int, AnswerCreate], Optional[AnswerRead]] = WriteBatcher(
+    "answers",
+    insert_answers_batch,
+    window=app_settings.answer_batch_window_ms / 1000,
+    max_items=app_settings.answer_batch_max_rows,
+)
+
+
+async def create_answers_bulk(
+    db: AsyncSession, question_id: int, answers: List[AnswerCreate]
+) -> Optional[List[AnswerRead]]:
+    logger.info(f"Создаем {len(answers)} ответов для вопроса с ID {question_id}")
+    try:
+        exists = await db.scalar(select(Question.id).where(Question.id == question_id))
+        if exists is None:
+            logger.warning(f"Вопрос с ID {question_id} не найден при создании ответов")
+            return None
+        if not answers:
+            return []
+
+        result = await db.execute(
+            insert(Answer).returning(
+                Answer.id,
+                Answer.question_id,
+                Answer.user_id,
+                Answer.text,
+                Answer.created_at,
+                sort_by_parameter_order=True,
+            ),
+            [
+                {"question_id": question_id, "user_id": answer.user_id, "text": answer.text}
+                for answer in answers
+            ],
         )
-        return new_answer
+        created = [AnswerRead.model_validate(row) for row in result.all()]
+        await db.commit()
+        question_cache.invalidate(question_id)
+        logger.info(f"Успешно создано {len(created)} ответов для вопроса с ID {question_id}")
+        return created
+    except IntegrityError as e:
+        await db.rollback()
+        # Вопрос мог быть удален между проверкой и вставкой
+        if is_foreign_key_violation(e):
+            logger.warning(f"Вопрос с ID {question_id} удален при создании ответов")
+            return None
+        logger.error(
+            f"Ошибка при массовом создании ответов к вопросу {question_id}: {str(e)}"
+        )
+        raise
     except Exception as e:
-        logger.error(f"Ошибка при создании ответа к вопросу с ID {question_id}: {str(e)}")
+        logger.error(
+            f"Ошибка при массовом создании ответов к вопросу {question_id}: {str(e)}"
+        )
+        await db.rollback()
         raise
 
 
@@ -122,19 +633,101 @@ async def get_answer(db: AsyncSession, answer_id: int) -> Optional[Answer]:
         raise
 
 
+async def get_answers_by_ids(db: AsyncSession, answer_ids: List[int]) -> Dict[int, Answer]:
+    logger.info(f"Получаем {len(answer_ids)} ответов по списку id")
+    try:
+        result = await db.execute(
+            select(Answer).where(
+                Answer.id == any_(bindparam("ids", answer_ids, type_=ARRAY(Integer)))
+            )
+        )
+        answers = {answer.id: answer for answer in result.scalars().all()}
+        logger.info(f"Успешно получено {len(answers)} из {len(answer_ids)} ответов")
+        return answers
+    except Exception as e:
+        logger.error(f"Ошибка при получении ответов по списку id: {str(e)}")
+        raise
+
+
+async def get_user_answers(
+    db: AsyncSession,
+    user_id: str,
+    limit: int = app_settings.page_size_default,
+    after: Optional[Tuple[datetime, int]] = None,
+    include_question: bool = False,
+) -> List[Row]:
+    """Ответы пользователя, новые первыми.
+
+    При include_question текст вопроса добавляется тем же запросом через JOIN.
+    """
+    logger.info(f"Получаем ответы пользователя {user_id}: limit={limit}, after={after}")
+    try:
+        columns = [
+            Answer.id,
+            Answer.question_id,
+            Answer.user_id,
+            Answer.text,
+            Answer.created_at,
+        ]
+        query = select(*columns)
+        if include_question:
+            query = select(*columns, Question.text.label("question_text")).join(
+                Question, Question.id == Answer.question_id
+            )
+        query = (
+            query.where(Answer.user_id == user_id)
+            .order_by(Answer.created_at.desc(), Answer.id.desc())
+            .limit(min(limit, app_settings.page_size_max))
+        )
+        if after is not None:
+            query = query.where(tuple_(Answer.created_at, Answer.id) < tuple_(*after))
+        result = await db.execute(query)
+        answers = list(result.all())
+        logger.info(f"Успешно получили {len(answers)} ответов пользователя {user_id}")
+        return answers
+    except Exception as e:
+        logger.error(f"Ошибка при получении ответов пользователя {user_id}: {str(e)}")
+        raise
+
+
 async def delete_answer(db: AsyncSession, answer_id: int) -> bool:
     logger.info(f"Удаляем ответ с ID {answer_id}")
     try:
-        result = await db.execute(select(Answer).where(Answer.id == answer_id))
-        answer = result.scalar_one_or_none()
-        if not answer:
+        question_id = await db.scalar(
+            delete(Answer)
+            .where(Answer.id == answer_id)
+            .returning(Answer.question_id)
+            .execution_options(synchronize_session=False)
+        )
+        if question_id is None:
             logger.warning(f"Ответ с ID {answer_id} не найден для удаления")
             return False
 
-        await db.delete(answer)
         await db.commit()
+        question_cache.invalidate(question_id)
         logger.info(f"Успешно удален ответ с ID {answer_id}")
         return True
     except Exception as e:
         logger.error(f"Ошибка при удалении ответа с ID {answer_id}: {str(e)}")
         raise
+
+
+async def delete_answers_bulk(db: AsyncSession, answer_ids: List[int]) -> List[int]:
+    logger.info(f"Удаляем {len(answer_ids)} ответов")
+    try:
+        result = await db.execute(
+            delete(Answer)
+            .where(Answer.id.in_(answer_ids))
+            .returning(Answer.id, Answer.question_id)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await db.commit()
+        for question_id in {row.question_id for row in rows}:
+            question_cache.invalidate(question_id)
+        logger.info(f"Успешно удалено {len(rows)} ответов")
+        return [row.id for row in rows]
+    except Exception as e:
+        logger.error(f"Ошибка при массовом удалении ответов: {str(e)}")
+        await db.rollback()
+        raise
@@ -0,0 +1,113 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, TypeVar
+
+from src.core.logging import get_logger
+from src.core import metrics
+
+logger = get_logger("questions_answers.services.singleflight")
+
+T = TypeVar("T")
+
+
+class LeaderCancelled(Exception):
+    """Запрос, выполнявший загрузку, был отменен до получения результата"""
+
+
+class SingleFlight:
+    """Объединение одновременных одинаковых загрузок в одну.
+
+    Первый запрос с ключом (лидер) выполняет загрузку, остальные запросы
+    с тем же ключом ждут ее результат или исключение. Результат не
+    сохраняется: следующий запрос после завершения загрузки начинает новую,
+    поэтому устаревших данных не добавляется. Ключ вычисляется функцией key
+    из тех же аргументов, что получает загрузка.
+
+    Если лидера отменили (например, клиент разорвал соединение), ожидающие
+    запросы не получают его отмену: один из них становится новым лидером.
+    """
+
+    def __init__(self, name: str, key: Callable[..., Hashable], enabled: bool = True):
+        self.name = name
+        self.key = key
+        self.enabled = enabled
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.retries = 0
+        flights.append(self)
+
+    async def do(self, load: Callable[..., Awaitable[T]], *args: Any) -> T:
+        if not self.enabled:
+            return await load(*args)
+        key = self.key(*args)
+        while True:
+            call = self._calls.get(key)
+            if call is None:
+                return await self._lead(key, load, args)
+            self.followers += 1
+            try:
+                # shield: отмена ожидающего запроса не должна отменять общий результат
+                return await asyncio.shield(call)
+            except LeaderCancelled:
+                self.retries += 1
+                logger.info(f"Загрузка {self.name} {key} прервана, повторяем")
+
+    async def _lead(self, key: Hashable, load: Callable[..., Awaitable[T]], args) -> T:
+        call = asyncio.get_running_loop().create_future()
+        self._calls[key] = call
+        self.leaders += 1
+        try:
+            result = await load(*args)
+        except Exception as e:
+            _settle(call, e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not call.done():
+                _settle(call, LeaderCancelled())
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "retries": self.retries,
+        }
+
+
+def _settle(call: "asyncio.Future[Any]", error: BaseException) -> None:
+    call.set_exception(error)
+    # Ожидающих может не быть, исключение не должно попадать в лог как непрочитанное
+    call.exception()
+
+
+flights: List[SingleFlight] = []
+
+
+def collect_single_flight_metrics() -> Iterable[metrics.Metric]:
+    in_flight = metrics.Gauge(
+        "single_flight_in_flight", "Выполняющиеся общие загрузки", ("name",)
+    )
+    calls = metrics.Counter(
+        "single_flight_calls_total",
+        "Запросы к общим загрузкам: leader выполнил загрузку, follower дождался чужой",
+        ("name", "role"),
+    )
+    retries = metrics.Counter(
+        "single_flight_retries_total", "Повторные загрузки после отмены лидера", ("name",)
+    )
+    for flight in flights:
+        in_flight.set(flight.in_flight(), (flight.name,))
+        calls.inc((flight.name, "leader"), flight.leaders)
+        calls.inc((flight.name, "follower"), flight.followers)
+        retries.inc((flight.name,), flight.retries)
+    return in_flight, calls, retries
+
+
+metrics.registry.add_collector(collect_single_flight_metrics)
@@ -4,10 +4,18 @@ import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
 from datetime import datetime
 
-from src.core.db_config import get_async_session
+from src.core.db_config import get_async_session, get_read_session
 from src.main import app
 from src.models.questions_answers import Question, Answer
 from src.schemas.questions_answers import QuestionRead, AnswerRead
+from src.services.cache import question_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_question_cache():
+    question_cache.clear()
+    yield
+    question_cache.clear()
 
 
 # Моки для ORM моделей
@@ -86,6 +94,7 @@ async def test_client(mock_session):
         yield mock_session
 
     app.dependency_overrides[get_async_session] = override_db
+    app.dependency_overrides[get_read_session] = override_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
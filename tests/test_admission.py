@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.core.admission import (
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+    TokenBucketLimiter,
+    route_class,
+)
+from src.core.metrics import MetricsMiddleware, registry
+
+
+def test_route_class():
+    assert route_class("GET", "/questions/1") == "read"
+    assert route_class("POST", "/answers/question/1") == "write"
+    assert route_class("GET", "/questions/export") == "heavy"
+    assert route_class("GET", "/questions/search") == "heavy"
+    assert route_class("GET", "/ready") is None
+    assert route_class("GET", "/metrics") is None
+    assert route_class("GET", "/") is None
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_and_hands_over_slot():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    assert await limiter.acquire()
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    limiter.release()
+
+    assert await waiting
+    assert limiter.active == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert not await limiter.acquire()
+    assert limiter.rejected_queue_full == 1
+    waiting.cancel()
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_after_queue_timeout():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=5, queue_timeout=0.01)
+    await limiter.acquire()
+
+    assert not await limiter.acquire()
+    assert limiter.rejected_timeout == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_does_not_take_slot():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=5, queue_timeout=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.sleep(0)
+    limiter.release()
+
+    assert limiter.active == 0
+    assert await limiter.acquire()
+
+
+def test_token_bucket_limits_and_refills():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    with patch("src.core.admission.time.monotonic", return_value=100.0):
+        assert limiter.acquire({"user_1": 1}) == 0
+        assert limiter.acquire({"user_1": 1}) == 0
+        assert limiter.acquire({"user_1": 1}) == pytest.approx(1.0)
+        assert limiter.acquire({"user_2": 1}) == 0
+    with patch("src.core.admission.time.monotonic", return_value=101.0):
+        assert limiter.acquire({"user_1": 1}) == 0
+
+
+def test_token_bucket_takes_all_keys_or_none():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    with patch("src.core.admission.time.monotonic", return_value=100.0):
+        limiter.acquire({"user_2": 2})
+
+        assert limiter.acquire({"user_1": 1, "user_2": 1}) > 0
+        assert limiter.retry_after("user_1", 2) == 0
+
+
+def test_token_bucket_disabled():
+    limiter = TokenBucketLimiter(rate=0, burst=1)
+
+    assert all(limiter.acquire({"user_1": 5}) == 0 for _ in range(10))
+
+
+@pytest.mark.asyncio
+async def test_admission_middleware_sheds_load():
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    limiter = ConcurrencyLimiter(limit=1, queue_size=0, queue_timeout=1)
+    app.add_middleware(AdmissionMiddleware, limiters={"read": limiter}, retry_after=3)
+    app.add_middleware(MetricsMiddleware)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        rejected = await client.get("/slow")
+        release.set()
+        admitted = await first
+
+    assert admitted.status_code == 200
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "3"
+    assert limiter.active == 0
+    # Отклоненный запрос не смешивается в метриках с неизвестными маршрутами
+    assert 'route="shed:read",status="503"' in registry.render()
@@ -0,0 +1,101 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.models.questions_answers import Answer, Question
+from src.schemas.questions_answers import AnswerCreate
+from src.services.questions_answers import delete_answers_bulk, insert_answers_batch
+
+# Триггеры статистики проверяются на настоящей PostgreSQL с примененными миграциями
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL не задан")
+
+QUESTIONS = 200
+ROUNDS = 100
+
+
+@pytest_asyncio.fixture
+async def pg_sessionmaker():
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=4)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    yield sessionmaker
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def question_ids(pg_sessionmaker):
+    async with pg_sessionmaker() as db:
+        questions = [Question(text=f"Вопрос {i}") for i in range(QUESTIONS)]
+        db.add_all(questions)
+        await db.commit()
+        ids = [question.id for question in questions]
+    yield ids
+    async with pg_sessionmaker() as db:
+        await db.execute(delete(Question).where(Question.id.in_(ids)))
+        await db.commit()
+
+
+async def answer_counts(sessionmaker, ids):
+    async with sessionmaker() as db:
+        result = await db.execute(select(Question.answer_count).where(Question.id.in_(ids)))
+        return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batches_with_opposite_question_order(pg_sessionmaker, question_ids):
+    # Небольшой пакет и пакет со всеми вопросами в обратном порядке обновляют
+    # вопросы по разным планам, без общего порядка блокировок это дает взаимоблокировки
+    items = [
+        (question_id, AnswerCreate(user_id="user", text="Ответ"))
+        for question_id in question_ids
+    ]
+    with patch("src.core.db_config.async_session", pg_sessionmaker):
+        for i in range(ROUNDS):
+            start = i % (QUESTIONS - 10)
+            backward, forward = await asyncio.gather(
+                insert_answers_batch(items[::-1]),
+                insert_answers_batch(items[start : start + 10]),
+            )
+            assert all(answer is not None for answer in backward + forward)
+
+    async with pg_sessionmaker() as db:
+        result = await db.execute(
+            select(func.count(Answer.id)).where(Answer.question_id.in_(question_ids))
+        )
+        total = result.scalar_one()
+        result = await db.execute(
+            select(func.sum(Question.answer_count)).where(Question.id.in_(question_ids))
+        )
+        assert result.scalar_one() == total == ROUNDS * (QUESTIONS + 10)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_bulk_deletes_with_opposite_question_order(
+    pg_sessionmaker, question_ids
+):
+    items = [
+        (question_id, AnswerCreate(user_id="user", text="Ответ"))
+        for question_id in question_ids
+    ]
+    with patch("src.core.db_config.async_session", pg_sessionmaker):
+        rounds = [await insert_answers_batch(items) for _ in range(ROUNDS)]
+
+    async def delete_ids(ids):
+        async with pg_sessionmaker() as db:
+            return await delete_answers_bulk(db, ids)
+
+    for i, answers in enumerate(rounds):
+        start = i % (QUESTIONS - 10)
+        answer_ids = [answer.id for answer in answers]
+        small = answer_ids[start : start + 10]
+        rest = [answer_id for answer_id in answer_ids if answer_id not in small]
+        backward, forward = await asyncio.gather(delete_ids(rest[::-1]), delete_ids(small))
+        assert len(backward) + len(forward) == QUESTIONS
+
+    assert await answer_counts(pg_sessionmaker, question_ids) == {0}
@@ -1,30 +1,33 @@
+from datetime import datetime
+from types import SimpleNamespace
+
 import pytest
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
 
+from src.core.admission import TokenBucketLimiter
+from src.services.pagination import decode_cursor
+
 
 @pytest.mark.asyncio
-async def test_create_answer(test_client: AsyncClient, mock_question_read, mock_answer_read):
+async def test_create_answer(test_client: AsyncClient, mock_answer_read):
     with patch(
-        "src.api.answers.get_question_with_answers",
-        new=AsyncMock(return_value=mock_question_read),
-    ):
-        with patch(
-            "src.api.answers.create_answer", new=AsyncMock(return_value=mock_answer_read)
-        ):
-            response = await test_client.post(
-                "/answers/question/1", json={"user_id": "user_1", "text": "Тест"}
-            )
+        "src.api.answers.create_answer", new=AsyncMock(return_value=mock_answer_read)
+    ) as mocked:
+        response = await test_client.post(
+            "/answers/question/1", json={"user_id": "user_1", "text": "Тест"}
+        )
 
     assert response.status_code == 201
     data = response.json()
     assert data["text"] == "Test answer"
     assert data["question_id"] == 1
+    mocked.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_create_answer_question_not_found(test_client: AsyncClient):
-    with patch("src.api.answers.get_question_with_answers", new=AsyncMock(return_value=None)):
+    with patch("src.api.answers.create_answer", new=AsyncMock(return_value=None)):
         response = await test_client.post(
             "/answers/question/999", json={"user_id": "user_1", "text": "Тест"}
         )
@@ -74,3 +77,139 @@ async def test_delete_answer_not_found(test_client: AsyncClient):
     data = response.json()
     assert "detail" in data
     assert data["detail"] == "Ответ не найден"
+
+
+@pytest.mark.asyncio
+async def test_get_answer_not_modified(test_client: AsyncClient, mock_answer_read):
+    with patch("src.api.answers.get_answer", new=AsyncMock(return_value=mock_answer_read)):
+        response = await test_client.get("/answers/1")
+        etag = response.headers["ETag"]
+        cached = await test_client.get("/answers/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    # Ответ может быть удален, поэтому клиент перепроверяет его по ETag
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk(test_client: AsyncClient, mock_answers_list):
+    with patch(
+        "src.api.answers.create_answers_bulk", new=AsyncMock(return_value=mock_answers_list)
+    ) as mocked:
+        response = await test_client.post(
+            "/answers/question/1/bulk",
+            json=[
+                {"user_id": "user_1", "text": "Один"},
+                {"user_id": "user_2", "text": "Два"},
+            ],
+        )
+
+    assert response.status_code == 201
+    assert [a["id"] for a in response.json()] == [1, 2]
+    assert mocked.call_args.args[1] == 1
+    assert len(mocked.call_args.args[2]) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk_question_not_found(test_client: AsyncClient):
+    with patch("src.api.answers.create_answers_bulk", new=AsyncMock(return_value=None)):
+        response = await test_client.post(
+            "/answers/question/999/bulk", json=[{"user_id": "user_1", "text": "Тест"}]
+        )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Вопрос не найден"
+
+
+@pytest.mark.asyncio
+async def test_delete_answers_bulk(test_client: AsyncClient):
+    with patch("src.api.answers.delete_answers_bulk", new=AsyncMock(return_value=[2])):
+        response = await test_client.delete("/answers/", params={"ids": [1, 2]})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [2], "not_found": [1]}
+
+
+@pytest.mark.asyncio
+async def test_delete_answers_bulk_requires_ids(test_client: AsyncClient):
+    response = await test_client.delete("/answers/")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_user_answers(test_client: AsyncClient):
+    now = datetime.now()
+    rows = [
+        SimpleNamespace(
+            id=i,
+            question_id=7,
+            user_id="user_1",
+            text=f"Ответ {i}",
+            created_at=now,
+            question_text="Вопрос",
+        )
+        for i in (3, 2)
+    ]
+    with patch(
+        "src.api.answers.get_user_answers", new=AsyncMock(return_value=rows)
+    ) as mocked:
+        response = await test_client.get(
+            "/answers/user/user_1", params={"limit": 2, "with_question": "true"}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [3, 2]
+    assert data[0]["question_text"] == "Вопрос"
+    assert mocked.call_args.kwargs["include_question"] is True
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == (now, 2)
+
+
+@pytest.mark.asyncio
+async def test_list_user_answers_without_question(test_client: AsyncClient, mock_answer_read):
+    with patch(
+        "src.api.answers.get_user_answers", new=AsyncMock(return_value=[mock_answer_read])
+    ):
+        response = await test_client.get("/answers/user/user_1")
+
+    assert response.status_code == 200
+    assert response.json()[0]["question_text"] is None
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_answers_bulk(test_client: AsyncClient, mock_answers_list):
+    found = {answer.id: answer for answer in mock_answers_list}
+    with patch("src.api.answers.get_answers_by_ids", new=AsyncMock(return_value=found)):
+        response = await test_client.get("/answers/bulk", params={"ids": [2, 1, 9]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [2, 1]
+    assert data["missing"] == [9]
+
+
+@pytest.mark.asyncio
+async def test_get_answers_bulk_requires_ids(test_client: AsyncClient):
+    response = await test_client.get("/answers/bulk")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_answer_rate_limited(test_client: AsyncClient, mock_answer_read):
+    limiter = TokenBucketLimiter(rate=1 / 60, burst=1)
+    with patch("src.api.answers.answer_rate_limiter", limiter), patch(
+        "src.api.answers.create_answer", new=AsyncMock(return_value=mock_answer_read)
+    ) as mocked:
+        payload = {"user_id": "user_1", "text": "Тест"}
+        first = await test_client.post("/answers/question/1", json=payload)
+        second = await test_client.post("/answers/question/1", json=payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 429
+    assert 59 <= int(second.headers["Retry-After"]) <= 60
+    mocked.assert_awaited_once()
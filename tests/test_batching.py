@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from src.services.batching import WriteBatcher
+
+
+def make_batcher(flush, window=0.01, max_items=10):
+    return WriteBatcher("test", flush, window=window, max_items=max_items)
+
+
+@pytest.mark.asyncio
+async def test_items_within_window_are_written_together():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    batcher = make_batcher(flush)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert results == [0, 10, 20]
+    assert batches == [[0, 1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting_for_window():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        return items
+
+    batcher = make_batcher(flush, window=60, max_items=2)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=1
+    )
+
+    assert results == [0, 1, 2, 3]
+    assert batches == [[0, 1], [2, 3]]
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_own_error():
+    async def flush(items):
+        return [ValueError(item) if item % 2 else item for item in items]
+
+    batcher = make_batcher(flush)
+    results = await asyncio.gather(
+        *(batcher.submit(i) for i in range(3)), return_exceptions=True
+    )
+
+    assert results[0] == 0 and results[2] == 2
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_flush_error_is_returned_to_all_callers():
+    async def flush(items):
+        raise RuntimeError("БД недоступна")
+
+    batcher = make_batcher(flush)
+    results = await asyncio.gather(
+        *(batcher.submit(i) for i in range(2)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_is_left_out_of_batch():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        return items
+
+    batcher = make_batcher(flush)
+    cancelled = asyncio.create_task(batcher.submit(1))
+    kept = asyncio.create_task(batcher.submit(2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await kept == 2
+    assert batches == [[2]]
+
+
+@pytest.mark.asyncio
+async def test_drain_writes_pending_batch():
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        return items
+
+    batcher = make_batcher(flush, window=60)
+    pending = asyncio.create_task(batcher.submit(1))
+    await asyncio.sleep(0)
+    await batcher.drain()
+
+    assert batches == [[1]]
+    assert await pending == 1
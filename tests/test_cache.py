@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from src.services.cache import LRUTTLCache, load_hot_keys, dump_hot_keys
+
+
+def test_cache_hit_and_miss():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+
+    assert cache.get(1) is None
+    cache.set(1, "first")
+
+    assert cache.get(1) == "first"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    cache.set(1, "first")
+    cache.set(2, "second")
+    cache.get(1)
+    cache.set(3, "third")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "first"
+    assert cache.get(3) == "third"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entry_expires():
+    cache = LRUTTLCache(max_size=2, ttl=10)
+    with patch("src.services.cache.time.monotonic", return_value=100.0):
+        cache.set(1, "first")
+    with patch("src.services.cache.time.monotonic", return_value=111.0):
+        assert cache.get(1) is None
+
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_skips_value_loaded_before_invalidation():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    token = cache.token(1)
+    cache.invalidate(1)
+    cache.set(1, "stale", token)
+
+    assert cache.get(1) is None
+
+
+def test_cache_invalidation_keeps_other_keys_loads():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    token = cache.token(1)
+    cache.invalidate(2)
+    cache.set(1, "first", token)
+
+    assert cache.token(1) == token
+    assert cache.get(1) == "first"
+
+
+def test_cache_skips_value_loaded_before_key_version_evicted():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    cache.invalidate(2)
+    tokens = {key: cache.token(key) for key in (1, 2)}
+    # Инвалидация ключей во время загрузки, затем вытеснение их версий
+    cache.invalidate(1)
+    cache.invalidate(2)
+    for other in range(10, 13):
+        cache.invalidate(other)
+    for key, token in tokens.items():
+        cache.set(key, "stale", token)
+
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+
+
+def test_cache_skips_value_loaded_before_clear():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    token = cache.token(1)
+    cache.clear()
+    cache.set(1, "stale", token)
+
+    assert cache.get(1) is None
+
+
+def test_cache_most_requested():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    for key in (1, 2, 2, 3, 3, 3):
+        cache.get(key)
+
+    assert cache.most_requested(2) == [3, 2]
+
+
+def test_hot_keys_roundtrip(tmp_path):
+    path = tmp_path / "hot.json"
+
+    assert load_hot_keys(path) == []
+    dump_hot_keys(path, [3, 2])
+    assert load_hot_keys(path) == [3, 2]
+
+
+def test_hot_keys_dump_replaces_file(tmp_path):
+    path = tmp_path / "hot.json"
+    path.write_text("[1, 2", encoding="utf-8")
+
+    dump_hot_keys(path, [5])
+
+    assert load_hot_keys(path) == [5]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUTTLCache(max_size=0, ttl=60)
+    cache.set(1, "first")
+
+    assert cache.get(1) is None
+    assert cache.most_requested(1) == []
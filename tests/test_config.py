@@ -0,0 +1,93 @@
+from unittest.mock import patch
+
+from src.core.config import (
+    AppSettings,
+    cpu_count,
+    max_primary_connections,
+    question_cache_size,
+    server_options,
+)
+
+
+def test_development_server_options():
+    options = server_options(AppSettings(server_mode="development", reload=True))
+
+    assert options["reload"] is True
+    assert "workers" not in options
+
+
+def test_production_server_options():
+    settings = AppSettings(
+        server_mode="production", reload=True, workers=4, server_limit_max_requests=10000
+    )
+
+    options = server_options(settings)
+
+    assert options["reload"] is False
+    assert options["workers"] == 4
+    assert options["limit_max_requests"] == 10000
+    assert options["backlog"] == settings.server_backlog
+
+
+def test_production_workers_default_to_cpu_count():
+    with patch("src.core.config.cpu_count", return_value=6):
+        options = server_options(AppSettings(server_mode="production", workers=0))
+
+    assert options["workers"] == 6
+    assert options["limit_max_requests"] is None
+
+
+def test_question_cache_disabled_with_several_workers():
+    settings = AppSettings(server_mode="production", workers=4, question_cache_size=1024)
+
+    assert question_cache_size(settings) == 0
+    settings.question_cache_multi_worker = True
+    assert question_cache_size(settings) == 1024
+
+
+def test_question_cache_enabled_with_single_worker():
+    development = AppSettings(server_mode="development", question_cache_size=1024)
+    production = AppSettings(server_mode="production", workers=1, question_cache_size=1024)
+
+    assert question_cache_size(development) == 1024
+    assert question_cache_size(production) == 1024
+
+
+def test_production_workers_limited_by_connection_budget():
+    settings = AppSettings(
+        server_mode="production",
+        workers=0,
+        db_pool_size=5,
+        db_max_overflow=10,
+        db_max_connections=100,
+    )
+    with patch("src.core.config.cpu_count", return_value=16):
+        options = server_options(settings)
+
+        assert options["workers"] == 6
+        assert max_primary_connections(settings) == 90
+
+
+def test_explicit_workers_not_limited_by_connection_budget():
+    settings = AppSettings(server_mode="production", workers=8, db_max_connections=30)
+
+    assert server_options(settings)["workers"] == 8
+    assert max_primary_connections(settings) > settings.db_max_connections
+
+
+def test_cpu_count_respects_cgroup_quota(tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    with (
+        patch("src.core.config.CGROUP_CPU_MAX", cpu_max),
+        patch("src.core.config.os.sched_getaffinity", return_value=set(range(16))),
+    ):
+        assert cpu_count() == 2
+        cpu_max.write_text("max 100000\n")
+        assert cpu_count() == 16
+
+
+def test_single_worker_not_recycled():
+    settings = AppSettings(server_mode="production", workers=1, server_limit_max_requests=10)
+
+    assert server_options(settings)["limit_max_requests"] is None
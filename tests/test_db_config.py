@@ -0,0 +1,163 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core import db_config
+
+from src.core.db_config import READ_PRIMARY_COOKIE, ReplicaRouter, wrote_recently
+from src.core.middleware import ReadYourWritesMiddleware
+from src.core.pool_metrics import PoolMetrics
+
+
+def make_replica():
+    replica = MagicMock()
+    replica.pool.metrics = PoolMetrics()
+    return replica
+
+
+class FakeSession:
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def connection(self):
+        if self.error is not None:
+            raise self.error
+
+
+def test_replica_router_round_robin():
+    replicas = [make_replica(), make_replica()]
+    router = ReplicaRouter(replicas, retry_seconds=30)
+
+    picked = [router.pick() for _ in range(4)]
+
+    assert picked[0] is picked[2]
+    assert picked[1] is picked[3]
+    assert picked[0] is not picked[1]
+
+
+def test_replica_router_skips_failed_replica():
+    healthy, failed = make_replica(), make_replica()
+    failed.pool.metrics.observe_failure()
+    router = ReplicaRouter([failed, healthy], retry_seconds=30)
+
+    assert {id(router.pick()) for _ in range(3)} == {id(router._session_factories[1])}
+
+
+def test_replica_router_falls_back_to_primary():
+    failed = make_replica()
+    failed.pool.metrics.observe_failure()
+
+    assert ReplicaRouter([failed], retry_seconds=30).pick() is None
+    assert ReplicaRouter([], retry_seconds=30).pick() is None
+
+
+@pytest.mark.asyncio
+async def test_read_falls_back_to_primary_when_replica_unreachable():
+    app = FastAPI()
+
+    @app.get("/items")
+    async def list_items(db=Depends(db_config.get_read_session)):
+        return {"session": db.name}
+
+    replica = make_replica()
+    router = ReplicaRouter([replica], retry_seconds=30)
+    replica_factory = MagicMock(return_value=FakeSession("replica", OSError("refused")))
+    router._session_factories = [replica_factory]
+    with (
+        patch("src.core.db_config.replica_router", router),
+        patch("src.core.db_config.async_session", lambda: FakeSession("primary")),
+    ):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/items")
+
+            assert response.status_code == 200
+            assert response.json() == {"session": "primary"}
+            assert router.pick() is None
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_cookie():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.post("/items")
+    async def create_item():
+        return {}
+
+    @app.get("/items")
+    async def list_items():
+        return []
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert READ_PRIMARY_COOKIE not in (await client.get("/items")).cookies
+        until = float((await client.post("/items")).cookies[READ_PRIMARY_COOKIE])
+    # Время в cookie округляется до миллисекунд
+    assert time.time() < until <= time.time() + 5 + 0.001
+
+
+def test_wrote_recently():
+    request = MagicMock()
+    request.cookies = {READ_PRIMARY_COOKIE: str(time.time() + 5)}
+    assert wrote_recently(request) is True
+
+    request.cookies = {READ_PRIMARY_COOKIE: str(time.time() - 5)}
+    assert wrote_recently(request) is False
+
+    request.cookies = {READ_PRIMARY_COOKIE: "garbage"}
+    assert wrote_recently(request) is False
+
+
+@pytest.mark.asyncio
+async def test_engines_created_on_init_and_disposed():
+    created = MagicMock()
+    created.dispose = AsyncMock()
+    with patch("src.core.db_config.create_engine", return_value=created) as factory:
+        db_config.init_engines()
+        db_config.init_engines()
+
+        assert factory.call_count == 1
+        assert db_config.engine is created
+        assert db_config.async_session is not None
+
+        await db_config.dispose_engines()
+
+    created.dispose.assert_awaited_once()
+    assert db_config.engine is None
+    assert db_config.async_session is None
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_limited_by_pool_size():
+    connection = MagicMock(spec=AsyncConnection)
+    bind_engine = MagicMock()
+    bind_engine.pool.size.return_value = 2
+    bind_engine.connect.return_value.start = AsyncMock(return_value=connection)
+
+    opened = await db_config.prewarm_pool(bind_engine, 5)
+
+    assert opened == 2
+    assert connection.close.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_survives_connection_errors():
+    bind_engine = MagicMock()
+    bind_engine.pool.size.return_value = 2
+    bind_engine.connect.return_value.start = AsyncMock(side_effect=OSError("refused"))
+
+    assert await db_config.prewarm_pool(bind_engine, 2) == 0
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.pool_metrics import InstrumentedAsyncPool, PoolMetrics
+
+
+def test_pool_metrics_snapshot():
+    metrics = PoolMetrics()
+    metrics.observe_wait(0.002)
+    metrics.observe_wait(0.004)
+    pool = MagicMock()
+    pool.size.return_value = 5
+    pool.checkedout.return_value = 3
+    pool.checkedin.return_value = 2
+    pool.overflow.return_value = -2
+
+    snapshot = metrics.snapshot(pool)
+
+    assert snapshot["checked_out"] == 3
+    assert snapshot["idle"] == 2
+    assert snapshot["overflow"] == 0
+    assert snapshot["checkouts"] == 2
+    assert snapshot["wait_avg_ms"] == 3.0
+    assert snapshot["wait_max_ms"] == 4.0
+
+
+def test_failed_checkout_not_counted_as_checkout():
+    def refuse():
+        raise ConnectionRefusedError("refused")
+
+    pool = InstrumentedAsyncPool(refuse, pool_size=1)
+    with pytest.raises(ConnectionRefusedError):
+        pool.connect()
+
+    snapshot = pool.metrics.snapshot(pool)
+    assert snapshot["failures"] == 1
+    assert snapshot["checkouts"] == 0
+    assert snapshot["wait_avg_ms"] == 0.0
+    assert snapshot["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_pool_status(test_client: AsyncClient):
+    status = {"size": 5, "checked_out": 1, "idle": 4, "overflow": 0}
+    with (
+        patch("src.api.internal.db_config.engine", MagicMock()),
+        patch("src.api.internal.db_config.pool_status", return_value=status),
+    ):
+        response = await test_client.get("/internal/pool")
+
+    assert response.status_code == 200
+    assert response.json()["primary"]["checked_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_pool_status_before_engines_created(test_client: AsyncClient):
+    with patch("src.api.internal.db_config.engine", None):
+        response = await test_client.get("/internal/pool")
+
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_get_cache_stats(test_client: AsyncClient):
+    response = await test_client.get("/internal/cache")
+
+    assert response.status_code == 200
+    assert "hits" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_ready(test_client: AsyncClient):
+    with patch("src.api.internal.readiness_problems", return_value=[]):
+        response = await test_client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_not_ready_when_pool_saturated(test_client: AsyncClient):
+    pool = MagicMock()
+    pool.checkedout.return_value = 15
+    pool.metrics = PoolMetrics()
+    pool.metrics.waiting = 3
+    with patch("src.core.admission.db_config.engine", MagicMock(pool=pool)):
+        response = await test_client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["problems"] == ["pool_saturated"]
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_engines_created(test_client: AsyncClient):
+    with patch("src.core.admission.db_config.engine", None):
+        response = await test_client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["problems"] == ["starting"]
@@ -0,0 +1,60 @@
+import json
+import logging
+import queue
+import sys
+
+from src.core.logging import BoundedQueueHandler, JSONFormatter, setup_logging
+
+
+def make_record(message="message", exc_info=None):
+    return logging.LogRecord(
+        "questions_answers.test", logging.INFO, __file__, 1, message, None, exc_info
+    )
+
+
+def test_queue_handler_drops_when_full():
+    log_queue = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(log_queue, overflow_policy="drop")
+
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+
+    assert handler.dropped == 1
+    assert log_queue.get_nowait().getMessage() == "first"
+    assert log_queue.empty()
+
+
+def test_queue_handler_reports_dropped_count():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, overflow_policy="count")
+
+    for message in ("first", "second", "third", "fourth"):
+        handler.handle(make_record(message))
+    log_queue.get_nowait()
+    log_queue.get_nowait()
+    handler.handle(make_record("fifth"))
+
+    assert handler.dropped == 2
+    assert log_queue.get_nowait().getMessage() == "fifth"
+    assert "потеряно сообщений: 2" in log_queue.get_nowait().getMessage()
+
+
+def test_prepared_record_keeps_exception_for_json():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(exc_info=sys.exc_info())
+
+    prepared = BoundedQueueHandler(queue.Queue()).prepare(record)
+    data = json.loads(JSONFormatter().format(prepared))
+
+    assert data["message"] == "message"
+    assert "ValueError: boom" in data["exception"]
+
+
+def test_setup_logging_is_idempotent():
+    logger = setup_logging()
+    handlers = list(logger.handlers)
+
+    assert setup_logging() is logger
+    assert logger.handlers == handlers
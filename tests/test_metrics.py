@@ -0,0 +1,58 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.metrics import Histogram, sql_operation
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Тест", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, ("/a",))
+    histogram.observe(0.5, ("/a",))
+    histogram.observe(5.0, ("/a",))
+
+    lines = histogram.render()
+
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/a"} 3' in lines
+
+
+def test_sql_operation():
+    assert sql_operation("  SELECT questions.id FROM questions") == "SELECT"
+    assert sql_operation("insert into answers values (1)") == "INSERT"
+    assert sql_operation("WITH deleted AS (DELETE FROM answers) SELECT 1") == "WITH"
+    assert sql_operation("BEGIN") == "OTHER"
+
+
+@pytest.mark.asyncio
+async def test_metrics_use_route_template(test_client: AsyncClient, mock_question_read):
+    with patch(
+        "src.api.questions.get_question_snapshot",
+        new=AsyncMock(return_value=mock_question_read),
+    ):
+        await test_client.get("/questions/12345")
+
+    response = await test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'http_requests_total{method="GET",route="/questions/{question_id}",status="200"}'
+        in body
+    )
+    assert "/questions/12345" not in body
+    assert "db_pool_connections" in body
+    assert "question_cache_events_total" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_unmatched_route(test_client: AsyncClient):
+    await test_client.get("/no-such-path")
+
+    response = await test_client.get("/metrics")
+
+    assert 'route="unmatched",status="404"' in response.text
@@ -1,7 +1,14 @@
+import json
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
 
+from src.core.config import app_settings
+from src.schemas.questions_answers import QuestionSearchResult, QuestionSummary
+from src.services.pagination import decode_count_cursor, decode_cursor, decode_rank_cursor
+
 
 @pytest.mark.asyncio
 async def test_create_question(test_client: AsyncClient, mock_question_read):
@@ -35,7 +42,7 @@ async def test_get_all_questions(test_client: AsyncClient, mock_questions_list):
 @pytest.mark.asyncio
 async def test_get_question_by_id(test_client: AsyncClient, mock_question_read):
     with patch(
-        "src.api.questions.get_question_with_answers",
+        "src.api.questions.get_question_snapshot",
         new=AsyncMock(return_value=mock_question_read),
     ):
         response = await test_client.get("/questions/1")
@@ -48,9 +55,7 @@ async def test_get_question_by_id(test_client: AsyncClient, mock_question_read):
 
 @pytest.mark.asyncio
 async def test_get_question_by_id_not_found(test_client: AsyncClient):
-    with patch(
-        "src.api.questions.get_question_with_answers", new=AsyncMock(return_value=None)
-    ):
+    with patch("src.api.questions.get_question_snapshot", new=AsyncMock(return_value=None)):
         response = await test_client.get("/questions/999")
 
     assert response.status_code == 404
@@ -76,3 +81,284 @@ async def test_delete_question_not_found(test_client: AsyncClient):
     data = response.json()
     assert "detail" in data
     assert data["detail"] == "Вопрос не найден"
+
+
+@pytest.mark.asyncio
+async def test_get_questions_next_cursor(test_client: AsyncClient, mock_questions_list):
+    with patch(
+        "src.api.questions.get_all_questions",
+        new=AsyncMock(return_value=mock_questions_list),
+    ):
+        response = await test_client.get("/questions/", params={"limit": 2})
+
+    assert response.status_code == 200
+    cursor = response.headers["X-Next-Cursor"]
+    last = mock_questions_list[-1]
+    assert decode_cursor(cursor) == (last.created_at, last.id)
+
+    with patch(
+        "src.api.questions.get_all_questions", new=AsyncMock(return_value=[])
+    ) as mocked:
+        response = await test_client.get("/questions/", params={"after": cursor})
+
+    assert response.status_code == 200
+    assert "X-Next-Cursor" not in response.headers
+    assert mocked.call_args.kwargs["after"] == (last.created_at, last.id)
+
+
+@pytest.mark.asyncio
+async def test_get_questions_invalid_cursor(test_client: AsyncClient):
+    response = await test_client.get("/questions/", params={"after": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Некорректный курсор"
+
+
+@pytest.mark.asyncio
+async def test_get_questions_limit_capped(test_client: AsyncClient):
+    response = await test_client.get("/questions/", params={"limit": 10_000})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_questions(test_client: AsyncClient, mock_questions_list):
+    async def fake_stream(db):
+        for question in mock_questions_list:
+            yield question
+
+    with patch("src.api.questions.stream_questions", new=fake_stream):
+        response = await test_client.get("/questions/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["text"] == "Test question"
+    assert json.loads(lines[1])["text"] == "Second question"
+
+
+@pytest.mark.asyncio
+async def test_get_questions_summary(test_client: AsyncClient):
+    rows = [
+        QuestionSummary(id=1, text="Test question", created_at=datetime.now(), answer_count=3)
+    ]
+    with patch("src.api.questions.get_questions_summary", new=AsyncMock(return_value=rows)):
+        response = await test_client.get("/questions/summary", params={"limit": 1})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["answer_count"] == 3
+    assert "answers" not in data[0]
+    assert "X-Next-Cursor" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_questions_summary_sorted_by_answers(test_client: AsyncClient):
+    rows = [
+        QuestionSummary(id=5, text="Популярный", created_at=datetime.now(), answer_count=40)
+    ]
+    with patch(
+        "src.api.questions.get_questions_summary", new=AsyncMock(return_value=rows)
+    ) as mocked:
+        response = await test_client.get(
+            "/questions/summary", params={"limit": 1, "sort": "answers"}
+        )
+
+    assert response.status_code == 200
+    assert decode_count_cursor(response.headers["X-Next-Cursor"]) == (40, 5)
+    assert mocked.call_args.kwargs["sort"] == "answers"
+
+    response = await test_client.get("/questions/summary", params={"sort": "popular"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_question_etag(test_client: AsyncClient, mock_question_read):
+    with patch(
+        "src.api.questions.get_question_snapshot",
+        new=AsyncMock(return_value=mock_question_read),
+    ):
+        response = await test_client.get("/questions/1")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"q-1-0-0"'
+    assert "Cache-Control" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_question_not_modified(test_client: AsyncClient):
+    snapshot = AsyncMock()
+    with patch("src.api.questions.get_question_version", new=AsyncMock(return_value=(2, 7))):
+        with patch("src.api.questions.get_question_snapshot", new=snapshot):
+            response = await test_client.get(
+                "/questions/1", headers={"If-None-Match": '"q-1-2-7"'}
+            )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"q-1-2-7"'
+    assert response.content == b""
+    snapshot.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_question_etag_changed(test_client: AsyncClient, mock_question_read):
+    with patch("src.api.questions.get_question_version", new=AsyncMock(return_value=(0, 0))):
+        with patch(
+            "src.api.questions.get_question_snapshot",
+            new=AsyncMock(return_value=mock_question_read),
+        ):
+            response = await test_client.get(
+                "/questions/1", headers={"If-None-Match": '"q-1-2-7"'}
+            )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk(test_client: AsyncClient, mock_questions_list):
+    with patch(
+        "src.api.questions.create_questions_bulk",
+        new=AsyncMock(return_value=mock_questions_list),
+    ) as mocked:
+        response = await test_client.post(
+            "/questions/bulk", json=[{"text": "Test question"}, {"text": "Second question"}]
+        )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [q["text"] for q in data["created"]] == ["Test question", "Second question"]
+    assert data["errors"] == []
+    assert [q.text for q in mocked.call_args.args[1]] == ["Test question", "Second question"]
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_atomic_rejects_invalid(test_client: AsyncClient):
+    mocked = AsyncMock()
+    with patch("src.api.questions.create_questions_bulk", new=mocked):
+        response = await test_client.post(
+            "/questions/bulk", json=[{"text": "Valid"}, {"text": ""}]
+        )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 1
+    mocked.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_partial(test_client: AsyncClient, mock_question_read):
+    with patch(
+        "src.api.questions.create_questions_bulk",
+        new=AsyncMock(return_value=[mock_question_read]),
+    ) as mocked:
+        response = await test_client.post(
+            "/questions/bulk",
+            params={"mode": "partial"},
+            json=[{"text": ""}, {"text": "Test question"}],
+        )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created"]) == 1
+    assert data["errors"][0]["index"] == 0
+    assert len(mocked.call_args.args[1]) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_partial_skips_non_objects(
+    test_client: AsyncClient, mock_question_read
+):
+    with patch(
+        "src.api.questions.create_questions_bulk",
+        new=AsyncMock(return_value=[mock_question_read]),
+    ) as mocked:
+        response = await test_client.post(
+            "/questions/bulk",
+            params={"mode": "partial"},
+            json=[5, {"text": "Test question"}, "text"],
+        )
+
+    assert response.status_code == 201
+    assert [error["index"] for error in response.json()["errors"]] == [0, 2]
+    assert len(mocked.call_args.args[1]) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_item_schema(test_client: AsyncClient):
+    schema = (await test_client.get("/openapi.json")).json()
+    body = schema["paths"]["/questions/bulk"]["post"]["requestBody"]["content"]
+
+    assert "QuestionCreate" in str(body["application/json"]["schema"])
+
+
+@pytest.mark.asyncio
+async def test_delete_questions_bulk(test_client: AsyncClient):
+    with patch(
+        "src.api.questions.delete_questions_bulk", new=AsyncMock(return_value=[3, 1])
+    ) as mocked:
+        response = await test_client.delete("/questions/", params={"ids": [1, 2, 3, 1]})
+
+    assert response.status_code == 200
+    assert response.json() == {"deleted": [1, 3], "not_found": [2]}
+    assert mocked.call_args.args[1] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_search_questions(test_client: AsyncClient):
+    results = [
+        QuestionSearchResult(
+            id=i,
+            text="Как выбрать кота",
+            created_at=datetime.now(),
+            rank=1.0 / i,
+            headline="Как выбрать <mark>кота</mark>",
+        )
+        for i in (1, 2)
+    ]
+    with patch(
+        "src.api.questions.search_questions", new=AsyncMock(return_value=results)
+    ) as mocked:
+        response = await test_client.get(
+            "/questions/search", params={"q": "кот", "answers": "true", "limit": 2}
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [1, 2]
+    assert data[0]["headline"] == "Как выбрать <mark>кота</mark>"
+    assert data[0]["answer_id"] is None
+    assert mocked.call_args.kwargs["include_answers"] is True
+    assert decode_rank_cursor(response.headers["X-Next-Cursor"]) == (0.5, 2)
+
+
+@pytest.mark.asyncio
+async def test_search_questions_validation(test_client: AsyncClient):
+    assert (await test_client.get("/questions/search")).status_code == 422
+    response = await test_client.get("/questions/search", params={"q": "кот", "after": "x"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_questions_bulk(test_client: AsyncClient, mock_questions_list):
+    found = {question.id: question for question in mock_questions_list}
+    with patch(
+        "src.api.questions.get_questions_by_ids", new=AsyncMock(return_value=found)
+    ) as mocked:
+        response = await test_client.get("/questions/bulk", params={"ids": [2, 5, 1, 2]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [2, 1]
+    assert data["missing"] == [5]
+    assert mocked.call_args.args[1] == [2, 5, 1]
+
+
+@pytest.mark.asyncio
+async def test_get_questions_bulk_too_many_ids(test_client: AsyncClient):
+    ids = list(range(1, app_settings.multi_get_max_ids + 2))
+    with patch("src.api.questions.get_questions_by_ids", new=AsyncMock()) as mocked:
+        response = await test_client.get("/questions/bulk", params={"ids": ids})
+
+    assert response.status_code == 422
+    mocked.assert_not_called()
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+
+from src.api.serialization import fast_response, question_payload, summary_payload
+from src.schemas.questions_answers import QuestionRead, QuestionSummary
+from src.services.cache import AnswerSnapshot, QuestionSnapshot
+
+CREATED_AT = [
+    datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc),
+    datetime(2024, 5, 1, 10, 30, 0, 123456, tzinfo=timezone.utc),
+    datetime(2024, 5, 1, 13, 30, 0, 500, tzinfo=timezone(timedelta(hours=3))),
+    datetime(2024, 5, 1, 10, 30, 5),
+]
+
+
+def make_question() -> QuestionSnapshot:
+    answers = tuple(
+        AnswerSnapshot(
+            id=i,
+            question_id=7,
+            user_id=f"user-{i}",
+            text=f'Ответ "{i}" \\ с\tспец\nсимволами \x01 и эмодзи 🙂',
+            created_at=CREATED_AT[i % len(CREATED_AT)],
+        )
+        for i in range(1, 9)
+    )
+    return QuestionSnapshot(7, "Почему так?", CREATED_AT[1], answers)
+
+
+@pytest.fixture
+def compare_client():
+    app = FastAPI()
+    question = make_question()
+    summary = QuestionSummary(id=1, text="Вопрос", created_at=CREATED_AT[2], answer_count=3)
+
+    @app.get("/model/question", response_model=QuestionRead)
+    async def model_question():
+        return question
+
+    @app.get("/fast/question", response_model=QuestionRead)
+    async def fast_question():
+        return fast_response(question_payload(question))
+
+    @app.get("/model/summary", response_model=list[QuestionSummary])
+    async def model_summary():
+        return [summary]
+
+    @app.get("/fast/summary", response_model=list[QuestionSummary])
+    async def fast_summary():
+        return fast_response([summary_payload(summary)])
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["question", "summary"])
+async def test_fast_response_matches_response_model_bytes(compare_client, name):
+    async with compare_client as client:
+        expected = await client.get(f"/model/{name}")
+        actual = await client.get(f"/fast/{name}")
+
+    assert actual.status_code == expected.status_code == 200
+    assert actual.headers["content-type"] == expected.headers["content-type"]
+    assert actual.content == expected.content
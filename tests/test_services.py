@@ -1,17 +1,37 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from src.models.questions_answers import Question
 from src.schemas.questions_answers import QuestionCreate, AnswerCreate
+from src.services.cache import question_cache
+from src.services.maintenance import repair_answer_stats
 from src.services.questions_answers import (
+    FOREIGN_KEY_VIOLATION,
     get_all_questions,
+    get_questions_summary,
+    search_questions,
     get_question_with_answers,
+    get_question_snapshot,
+    get_question_version,
+    question_load_key,
+    get_questions_by_ids,
     create_question,
+    create_questions_bulk,
     delete_question,
+    delete_questions_bulk,
     create_answer,
+    insert_answers_batch,
+    create_answers_bulk,
     get_answer,
+    get_answers_by_ids,
+    get_user_answers,
     delete_answer,
+    delete_answers_bulk,
 )
 
 
@@ -34,6 +54,18 @@ async def test_get_all_questions(mock_session, mock_question_model):
     assert result[0] == mock_question_model
 
 
+@pytest.mark.asyncio
+async def test_get_all_questions_after_cursor(mock_session, mock_question_model):
+    mock_session.execute.return_value = make_scalar_result(mock_question_model)
+
+    await get_all_questions(mock_session, limit=10, after=(datetime.now(), 5))
+
+    query = str(mock_session.execute.call_args.args[0])
+    assert "ORDER BY questions.created_at, questions.id" in query
+    assert "(questions.created_at, questions.id) >" in query
+    assert "OFFSET" not in query
+
+
 @pytest.mark.asyncio
 async def test_get_question_with_answers_found(mock_session, mock_question_model):
     mock_session.execute.return_value = make_scalar_result(mock_question_model)
@@ -54,59 +86,88 @@ async def test_get_question_with_answers_not_found(mock_session):
 
 
 @pytest.mark.asyncio
-async def test_create_question(mock_session, mock_question_model):
-    async def test_create_question(mock_session, mock_question_model):
-        payload = QuestionCreate(text="New question")
+async def test_get_question_snapshot_cached(mock_session, mock_answer_model):
+    question = MagicMock(spec=Question)
+    question.id = 1
+    question.text = "Test question"
+    question.created_at = datetime.now()
+    question.answers = [mock_answer_model]
+    mock_session.execute.return_value = make_scalar_result(question)
 
-        new_question = Question(text="New question")
-        new_question.id = 1
+    first = await get_question_snapshot(mock_session, 1)
+    second = await get_question_snapshot(mock_session, 1)
 
-        mock_session.execute.return_value = make_scalar_result(mock_question_model)
+    mock_session.execute.assert_called_once()
+    assert first is second
+    assert first.answers[0].text == "Test answer"
 
-        with patch(
-            "src.services.questions_answers.Question",
-            side_effect=lambda **kwargs: new_question,
-        ):
-            result = await create_question(mock_session, payload)
 
-        mock_session.add.assert_called_once_with(new_question)
-        mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once_with(
-            new_question, attribute_names=["answers"]
-        )
-        assert result == mock_question_model
+@pytest.mark.asyncio
+async def test_get_question_version_ignores_cache(mock_session):
+    question_cache.set(1, "snapshot")
+    mock_session.execute.return_value.one_or_none = MagicMock(return_value=(2, 7))
+
+    assert await get_question_version(mock_session, 1) == (2, 7)
+    mock_session.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_delete_answer_invalidates_question_cache(mock_session, mock_answer_model):
+    question_cache.set(1, "snapshot")
+    mock_session.scalar.return_value = 1
+
+    await delete_answer(mock_session, 1)
+
+    assert question_cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_create_question(mock_session, mock_question_model):
+    payload = QuestionCreate(text="New question")
+    mock_session.scalar.return_value = mock_question_model
+
+    with patch("src.services.questions_answers.set_committed_value") as set_value:
+        result = await create_question(mock_session, payload)
+
+    mock_session.scalar.assert_called_once()
+    mock_session.execute.assert_not_called()
+    mock_session.refresh.assert_not_called()
+    mock_session.commit.assert_called_once()
+    set_value.assert_called_once_with(mock_question_model, "answers", [])
+    assert result == mock_question_model
 
 
 @pytest.mark.asyncio
 async def test_create_question_database_error(mock_session):
     payload = QuestionCreate(text="New question")
-    new_question = Question(text="New question")
 
-    mock_session.commit.side_effect = Exception("Database connection error")
+    mock_session.scalar.side_effect = Exception("Database connection error")
 
-    with patch("src.services.questions_answers.Question", return_value=new_question):
-        with pytest.raises(Exception, match="Database connection error"):
-            await create_question(mock_session, payload)
+    with pytest.raises(Exception, match="Database connection error"):
+        await create_question(mock_session, payload)
 
-    mock_session.add.assert_called_once_with(new_question)
-    mock_session.refresh.assert_not_called()
+    mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_delete_question_found(mock_session, mock_question_model):
-    mock_session.execute.return_value = make_scalar_result(mock_question_model)
+async def test_delete_question_found(mock_session):
+    mock_session.scalar.return_value = 1
 
     result = await delete_question(mock_session, 1)
 
-    mock_session.execute.assert_called_once()
-    mock_session.delete.assert_called_once_with(mock_question_model)
+    mock_session.scalar.assert_called_once()
+    query = str(mock_session.scalar.call_args.args[0])
+    assert query.startswith("DELETE FROM questions")
+    assert "RETURNING questions.id" in query
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
     assert result is True
 
 
 @pytest.mark.asyncio
 async def test_delete_question_not_found(mock_session):
-    mock_session.execute.return_value = make_scalar_result(None)
+    mock_session.scalar.return_value = None
 
     result = await delete_question(mock_session, 999)
 
@@ -116,44 +177,44 @@ async def test_delete_question_not_found(mock_session):
 
 
 @pytest.mark.asyncio
-async def test_create_answer_success(mock_session, mock_question_model, mock_answer_model):
+async def test_create_answer_success(mock_session, mock_answer_model):
     payload = AnswerCreate(user_id="u1", text="hello")
+    question_cache.set(1, "snapshot")
 
-    mock_session.execute.return_value = make_scalar_result(mock_question_model)
+    mock_session.scalar.return_value = mock_answer_model
 
-    with patch("src.services.questions_answers.Answer", return_value=mock_answer_model):
-        result = await create_answer(mock_session, 1, payload)
+    result = await create_answer(mock_session, 1, payload)
 
-    mock_session.add.assert_called_once_with(mock_answer_model)
+    mock_session.scalar.assert_called_once()
+    mock_session.execute.assert_not_called()
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once_with(mock_answer_model)
+    mock_session.refresh.assert_not_called()
     assert result == mock_answer_model
+    assert question_cache.get(1) is None
 
 
 @pytest.mark.asyncio
 async def test_create_answer_question_not_found(mock_session):
     payload = AnswerCreate(user_id="u1", text="hello")
 
-    mock_session.execute.return_value = make_scalar_result(None)
+    mock_session.scalar.side_effect = IntegrityError(
+        "INSERT", {}, MagicMock(sqlstate=FOREIGN_KEY_VIOLATION)
+    )
 
     result = await create_answer(mock_session, 999, payload)
 
-    mock_session.add.assert_not_called()
     mock_session.commit.assert_not_called()
+    mock_session.rollback.assert_called_once()
     assert result is None
 
 
 @pytest.mark.asyncio
-async def test_create_answer_database_error(mock_session, mock_question_model):
+async def test_create_answer_database_error(mock_session, mock_answer_model):
     payload = AnswerCreate(user_id="u1", text="hello")
 
-    mock_session.execute.return_value = make_scalar_result(mock_question_model)
+    mock_session.scalar.return_value = mock_answer_model
     mock_session.commit.side_effect = Exception("Database error")
 
-    from src.services.questions_answers import Answer as AnswerModel
-
-    AnswerModel.__call__ = MagicMock()
-
     with pytest.raises(Exception, match="Database error"):
         await create_answer(mock_session, 1, payload)
 
@@ -179,22 +240,341 @@ async def test_get_answer_not_found(mock_session):
 
 
 @pytest.mark.asyncio
-async def test_delete_answer_found(mock_session, mock_answer_model):
-    mock_session.execute.return_value = make_scalar_result(mock_answer_model)
+async def test_delete_answer_found(mock_session):
+    mock_session.scalar.return_value = 1
 
     result = await delete_answer(mock_session, 1)
 
-    mock_session.delete.assert_called_once_with(mock_answer_model)
+    assert str(mock_session.scalar.call_args.args[0]).startswith("DELETE FROM answers")
+    mock_session.delete.assert_not_called()
     mock_session.commit.assert_called_once()
     assert result is True
 
 
 @pytest.mark.asyncio
 async def test_delete_answer_not_found(mock_session):
-    mock_session.execute.return_value = make_scalar_result(None)
+    mock_session.scalar.return_value = None
 
     result = await delete_answer(mock_session, 999)
 
     mock_session.delete.assert_not_called()
     mock_session.commit.assert_not_called()
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_get_questions_summary_does_not_load_answers(mock_session):
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    result = await get_questions_summary(mock_session, limit=10)
+
+    query = str(mock_session.execute.call_args.args[0])
+    assert "questions.answer_count" in query
+    assert "answers" not in query.replace("answer_count", "").replace("last_answer_at", "")
+    assert result == []
+
+
+@pytest.mark.asyncio
+async def test_get_questions_summary_sorted_by_answers(mock_session):
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    await get_questions_summary(mock_session, limit=10, after=(3, 7), sort="answers")
+
+    query = str(mock_session.execute.call_args.args[0])
+    assert "ORDER BY questions.answer_count DESC, questions.id DESC" in query
+    assert "(questions.answer_count, questions.id) <" in query
+
+
+@pytest.mark.asyncio
+async def test_get_questions_summary_sorted_by_activity(mock_session):
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    await get_questions_summary(mock_session, limit=10, sort="activity")
+
+    query = str(mock_session.execute.call_args.args[0])
+    assert "questions.last_answer_at IS NOT NULL" in query
+    assert "ORDER BY questions.last_answer_at DESC, questions.id DESC" in query
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_single_statement(mock_session):
+    now = datetime.now()
+    rows = [MagicMock(id=i, text=f"q{i}", created_at=now) for i in (1, 2)]
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+
+    result = await create_questions_bulk(
+        mock_session, [QuestionCreate(text="q1"), QuestionCreate(text="q2")]
+    )
+
+    mock_session.execute.assert_called_once()
+    assert mock_session.execute.call_args.args[1] == [{"text": "q1"}, {"text": "q2"}]
+    mock_session.commit.assert_called_once()
+    assert [q.id for q in result] == [1, 2]
+    assert result[0].answers == []
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk(mock_session):
+    now = datetime.now()
+    rows = [
+        MagicMock(id=i, question_id=1, user_id="u1", text=f"a{i}", created_at=now)
+        for i in (1, 2)
+    ]
+    mock_session.scalar.return_value = 1
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+
+    result = await create_answers_bulk(
+        mock_session,
+        1,
+        [AnswerCreate(user_id="u1", text="a1"), AnswerCreate(user_id="u1", text="a2")],
+    )
+
+    mock_session.scalar.assert_called_once()
+    mock_session.execute.assert_called_once()
+    assert len(mock_session.execute.call_args.args[1]) == 2
+    assert [a.id for a in result] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk_question_not_found(mock_session):
+    mock_session.scalar.return_value = None
+
+    result = await create_answers_bulk(
+        mock_session, 999, [AnswerCreate(user_id="u", text="a")]
+    )
+
+    mock_session.execute.assert_not_called()
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_delete_questions_bulk(mock_session):
+    mock_session.execute.return_value = make_scalar_result(2)
+    question_cache.set(2, "snapshot")
+
+    result = await delete_questions_bulk(mock_session, [1, 2])
+
+    mock_session.execute.assert_called_once()
+    mock_session.commit.assert_called_once()
+    assert result == [2]
+    assert question_cache.get(2) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_answers_bulk(mock_session):
+    rows = [MagicMock(id=5, question_id=1), MagicMock(id=6, question_id=1)]
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+    question_cache.set(1, "snapshot")
+
+    result = await delete_answers_bulk(mock_session, [5, 6, 7])
+
+    mock_session.commit.assert_called_once()
+    assert result == [5, 6]
+    assert question_cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_search_questions_with_answers(mock_session):
+    question_row = SimpleNamespace(
+        id=1, text="Кот", created_at=datetime.now(), rank=0.1, headline="<mark>Кот</mark>"
+    )
+    mock_session.execute.side_effect = [
+        MagicMock(all=MagicMock(return_value=[question_row])),
+        MagicMock(all=MagicMock(return_value=[(1, 10, "про <mark>кота</mark>")])),
+    ]
+
+    result = await search_questions(
+        mock_session, "кот", include_answers=True, limit=5, after=(0.5, 3)
+    )
+
+    query = str(mock_session.execute.call_args_list[0].args[0])
+    assert "websearch_to_tsquery" in query
+    assert "UNION ALL" in query
+    assert "(matches.rank, matches.id) <" in query
+    assert result[0].headline == "<mark>Кот</mark>"
+    assert result[0].answer_id == 10
+    assert result[0].answer_headline == "про <mark>кота</mark>"
+
+
+@pytest.mark.asyncio
+async def test_search_questions_only_questions(mock_session):
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    result = await search_questions(mock_session, "кот")
+
+    assert result == []
+    mock_session.execute.assert_called_once()
+    assert "answers" not in str(mock_session.execute.call_args.args[0])
+
+
+@pytest.mark.asyncio
+async def test_repair_answer_stats_in_batches(mock_session):
+    mock_session.scalar.return_value = 2500
+    mock_session.execute.return_value = MagicMock(rowcount=2)
+
+    repaired = await repair_answer_stats(mock_session, batch_size=1000)
+
+    # Для каждого из трех пакетов: блокировка вопросов и пересчет
+    assert mock_session.execute.call_count == 6
+    assert "FOR UPDATE" in str(mock_session.execute.call_args_list[0].args[0])
+    assert "IS DISTINCT FROM" in str(mock_session.execute.call_args_list[1].args[0])
+    assert repaired == 6
+
+
+@pytest.mark.asyncio
+async def test_get_user_answers_with_question(mock_session):
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+    await get_user_answers(
+        mock_session, "user_1", limit=10, after=(datetime.now(), 5), include_question=True
+    )
+
+    mock_session.execute.assert_called_once()
+    query = str(mock_session.execute.call_args.args[0])
+    assert "JOIN questions ON questions.id = answers.question_id" in query
+    assert "answers.user_id = :user_id_1" in query
+    assert "(answers.created_at, answers.id) <" in query
+    assert "ORDER BY answers.created_at DESC, answers.id DESC" in query
+
+
+@pytest.mark.asyncio
+async def test_get_questions_by_ids_loads_only_uncached(mock_session, mock_answer_model):
+    question = MagicMock(spec=Question)
+    question.id = 1
+    question.text = "Test question"
+    question.created_at = datetime.now()
+    question.answers = [mock_answer_model]
+    mock_session.execute.return_value = make_scalar_result(question)
+    await get_question_snapshot(mock_session, 1)
+    mock_session.execute.reset_mock()
+    mock_session.execute.return_value = make_scalar_result(None)
+
+    found = await get_questions_by_ids(mock_session, [1, 7, 8])
+
+    mock_session.execute.assert_called_once()
+    statement = mock_session.execute.call_args.args[0]
+    assert "questions.id = ANY" in str(statement)
+    assert statement.compile().params["ids"] == [7, 8]
+    assert list(found) == [1]
+
+
+@pytest.mark.asyncio
+async def test_get_questions_by_ids_all_cached(mock_session):
+    snapshot = SimpleNamespace(id=3, answers=[])
+    question_cache.set(3, snapshot)
+
+    found = await get_questions_by_ids(mock_session, [3])
+
+    mock_session.execute.assert_not_called()
+    assert found == {3: snapshot}
+
+
+@pytest.mark.asyncio
+async def test_get_answers_by_ids(mock_session, mock_answer_model):
+    mock_session.execute.return_value = make_scalar_result(mock_answer_model)
+
+    found = await get_answers_by_ids(mock_session, [1, 2])
+
+    mock_session.execute.assert_called_once()
+    assert "answers.id = ANY" in str(mock_session.execute.call_args.args[0])
+    assert found == {1: mock_answer_model}
+
+
+@pytest.mark.asyncio
+async def test_get_question_snapshot_coalesces_concurrent_loads(
+    mock_session, mock_answer_model
+):
+    question = MagicMock(spec=Question)
+    question.id = 1
+    question.text = "Test question"
+    question.created_at = datetime.now()
+    question.answers = [mock_answer_model]
+    release = asyncio.Event()
+
+    async def execute(*args, **kwargs):
+        await release.wait()
+        return make_scalar_result(question)
+
+    mock_session.execute.side_effect = execute
+    tasks = [asyncio.create_task(get_question_snapshot(mock_session, 1)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    snapshots = await asyncio.gather(*tasks)
+
+    mock_session.execute.assert_called_once()
+    assert snapshots[0] is snapshots[1] is snapshots[2]
+
+
+def test_question_load_key_separates_replica_reads(mock_session):
+    mock_session.info = {}
+    primary = question_load_key(mock_session, 1)
+    mock_session.info = {"replica": True}
+
+    assert question_load_key(mock_session, 1) != primary
+    question_cache.invalidate(2)
+    assert question_load_key(mock_session, 1)[2] == primary[2]
+    question_cache.invalidate(1)
+    assert question_load_key(mock_session, 1)[2] != primary[2]
+
+
+def answer_row(answer_id, question_id=1):
+    return SimpleNamespace(
+        id=answer_id,
+        question_id=question_id,
+        user_id="u1",
+        text="hello",
+        created_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def batch_session(mock_session):
+    mock_session.__aenter__.return_value = mock_session
+    mock_session.begin_nested = MagicMock()
+    with patch("src.core.db_config.async_session", return_value=mock_session):
+        yield mock_session
+
+
+@pytest.mark.asyncio
+async def test_create_answer_batched(batch_session):
+    batch_session.execute.return_value = MagicMock(
+        all=MagicMock(return_value=[answer_row(10), answer_row(11), answer_row(12, 2)])
+    )
+    payload = AnswerCreate(user_id="u1", text="hello")
+    request_session = AsyncMock()
+
+    with patch("src.services.questions_answers.app_settings.answer_batch_enabled", True):
+        created = await asyncio.gather(
+            create_answer(request_session, 1, payload),
+            create_answer(request_session, 1, payload),
+            create_answer(request_session, 2, payload),
+        )
+
+    batch_session.execute.assert_called_once()
+    assert len(batch_session.execute.call_args.args[1]) == 3
+    batch_session.commit.assert_called_once()
+    request_session.execute.assert_not_called()
+    assert [answer.id for answer in created] == [10, 11, 12]
+
+
+@pytest.mark.asyncio
+async def test_insert_answers_batch_isolates_missing_question(batch_session):
+    foreign_key_error = IntegrityError(
+        "INSERT", {}, MagicMock(sqlstate=FOREIGN_KEY_VIOLATION)
+    )
+    batch_session.execute.side_effect = [
+        foreign_key_error,
+        MagicMock(one=MagicMock(return_value=answer_row(10))),
+        foreign_key_error,
+        MagicMock(one=MagicMock(return_value=answer_row(11))),
+    ]
+    payload = AnswerCreate(user_id="u1", text="hello")
+
+    outcomes = await insert_answers_batch([(1, payload), (999, payload), (1, payload)])
+
+    batch_session.rollback.assert_called_once()
+    assert batch_session.begin_nested.call_count == 3
+    batch_session.commit.assert_called_once()
+    assert outcomes[0].id == 10
+    assert outcomes[1] is None
+    assert outcomes[2].id == 11
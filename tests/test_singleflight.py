@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from src.services.singleflight import SingleFlight
+
+
+def make_flight(**kwargs):
+    return SingleFlight("test", key=lambda key: key, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_load():
+    flight = make_flight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load(key):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return f"value {key}"
+
+    tasks = [asyncio.create_task(flight.do(load, 1)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.in_flight() == 1
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["value 1"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 4, "retries": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_load_separately():
+    flight = make_flight()
+
+    async def load(key):
+        await asyncio.sleep(0)
+        return key
+
+    assert await asyncio.gather(flight.do(load, 1), flight.do(load, 2)) == [1, 2]
+    assert flight.leaders == 2
+
+
+@pytest.mark.asyncio
+async def test_completed_load_is_not_reused():
+    flight = make_flight()
+
+    async def load(key):
+        return object()
+
+    assert await flight.do(load, 1) is not await flight.do(load, 1)
+    assert flight.leaders == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_with_followers():
+    flight = make_flight()
+    release = asyncio.Event()
+
+    async def load(key):
+        await release.wait()
+        raise ValueError("ошибка БД")
+
+    tasks = [asyncio.create_task(flight.do(load, 1)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.leaders == 1
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_promotes_follower():
+    flight = make_flight()
+    loads = []
+
+    async def load(key):
+        loads.append(key)
+        await asyncio.sleep(0.01 if len(loads) == 1 else 0)
+        return "value"
+
+    leader = asyncio.create_task(flight.do(load, 1))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do(load, 1))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "value"
+    assert leader.cancelled()
+    assert len(loads) == 2
+    assert flight.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_follower_cancellation_does_not_cancel_load():
+    flight = make_flight()
+    release = asyncio.Event()
+
+    async def load(key):
+        await release.wait()
+        return "value"
+
+    leader = asyncio.create_task(flight.do(load, 1))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do(load, 1))
+    await asyncio.sleep(0)
+    follower.cancel()
+    release.set()
+
+    assert await leader == "value"
+    assert follower.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_disabled_flight_loads_every_time():
+    flight = make_flight(enabled=False)
+    calls = 0
+
+    async def load(key):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+
+    await asyncio.gather(flight.do(load, 1), flight.do(load, 1))
+    assert calls == 2